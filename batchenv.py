@@ -0,0 +1,321 @@
+# batchenv.py — Many headless matches stepped in lockstep on NumPy arrays
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from game import Game
+from player import ACTION_DIRECTIONS, ACTION_NONE, Player
+from tournament import RandomWalker
+
+DIR_X = np.array([d[0] for d in ACTION_DIRECTIONS], dtype=np.int32)
+DIR_Y = np.array([d[1] for d in ACTION_DIRECTIONS], dtype=np.int32)
+NORMAL, PELLET = 1, 2  # values in the dots tensor
+
+
+class BatchEnv:
+    """B headless matches whose whole state lives in NumPy arrays.
+
+    Player arrays are shaped (B, P); ``walls`` and ``dots`` are (B, H+2, W+2)
+    grids padded with a wall border like ``Maze.cells``. ``step(actions)``
+    takes a (B, P) array of ``player.ACTION_*`` codes and advances every
+    unfinished match one tick with the same rules, in the same order, as
+    ``Game.update``, so a seeded match ends in exactly the same state.
+
+    Each match is created by a real headless ``Game`` and keeps its ``Maze``
+    (and with it the match rng) for the rare random events, respawns and
+    dot waves, which go through ``Maze.get_valid_positions`` one match at a
+    time. Players always sit on whole cells, so "touching" reduces to
+    "same cell", and dots are stored one per cell, as the game places them.
+    """
+
+    def __init__(self, seeds, **options):
+        self.options = options
+        self.seeds = list(seeds)
+        games = [Game(None, seed=s, **options) for s in self.seeds]
+        g = games[0]
+        self.B, self.P = len(games), len(g.players)
+        self.cell, self.top = g.cell, g.TOP_MARGIN
+        self.W, self.H = g.maze.width, g.maze.height
+        self.world_w, self.world_h = g.world_w, g.world_h
+        self.move_cooldown_reset = g.players[0].MOVE_COOLDOWN
+        self.respawn_delay, self.dot_intv, self.dot_amt = g.respawn_delay, g.dot_intv, g.dot_amt
+        self.max_ticks = g.max_ticks
+        self.prey = np.array([[o in p.prey_set for o in g.players] for p in g.players])
+
+        B, P, shape = self.B, self.P, (self.B, self.H + 2, self.W + 2)
+        self.walls = np.ones(shape, dtype=np.uint8)
+        self.dots = np.zeros(shape, dtype=np.uint8)
+        self.n_dots = np.zeros(B, dtype=np.int64)
+        self.ticks = np.zeros(B, dtype=np.int64)
+        self.dot_timer = np.zeros(B, dtype=np.int64)
+        self.done = np.zeros(B, dtype=bool)
+        for name in Player.STATE_FIELDS:
+            flag = name in ("alive", "power_mode")
+            setattr(self, name, np.zeros((B, P), dtype=bool if flag else np.int64))
+        self.mazes = [None] * B
+
+        # Which neighbour cells a player can eat each kind of dot in; the
+        # Player.collides_with_dot rule evaluated once for this cell size
+        base = self.cell // 2
+        self.reach = []
+        for oy in (-1, 0, 1):
+            for ox in (-1, 0, 1):
+                hits = [(r - ox * self.cell) ** 2 + (r - oy * self.cell) ** 2 < (2 * r) ** 2
+                        for r in (base // 2, base)]
+                if any(hits):
+                    self.reach.append((ox, oy, hits[0], hits[1]))
+
+        for b, game in enumerate(games):
+            self.load(b, game)
+
+    # --------------------------------------------------
+    # Copy one Game's full state into slot b
+    # --------------------------------------------------
+    def load(self, b, game):
+        self.mazes[b] = game.maze
+        self.walls[b] = game.maze.cells
+        self.dots[b] = 0
+        for d in game.dots:
+            gx, gy = d.x // self.cell, (d.y - self.top) // self.cell
+            self.dots[b, gy + 1, gx + 1] = PELLET if d.is_power_pellet else NORMAL
+        self.n_dots[b] = np.count_nonzero(self.dots[b])
+        self.ticks[b], self.dot_timer[b], self.done[b] = game.ticks, game.dot_timer, game.game_over
+        for i, p in enumerate(game.players):
+            for name, value in zip(Player.STATE_FIELDS, p.get_state()):
+                getattr(self, name)[b, i] = value
+
+    def reset(self, b, seed=None):
+        """Start a fresh match in slot b (e.g. once ``done[b]``)."""
+        seed = random.randrange(2**32) if seed is None else seed
+        self.seeds[b] = seed
+        self.load(b, Game(None, seed=seed, **self.options))
+
+    # --------------------------------------------------
+    # One tick of every unfinished match (Game.step / Game.update)
+    # --------------------------------------------------
+    def step(self, actions):
+        act = np.asarray(actions)
+        live = ~self.done
+        cell, top = self.cell, self.top
+
+        # ---- Actions (Player.apply_action; Game.step applies them even after game over) ----
+        self.direction_x, self.direction_y = DIR_X[act], DIR_Y[act]
+        turned = act != ACTION_NONE
+        self.last_dir_x = np.where(turned, self.direction_x, self.last_dir_x)
+        self.last_dir_y = np.where(turned, self.direction_y, self.last_dir_y)
+        self.ticks += live
+
+        # ---- Player Movement (Player.calculate_new_position) ----
+        want = live[:, None] & self.alive & ((self.direction_x != 0) | (self.direction_y != 0))
+        waiting = want & (self.move_cooldown > 0)
+        self.move_cooldown -= waiting
+        trying = want & ~waiting
+        nx = np.clip(self.x + self.direction_x * cell, 0, self.world_w - cell)
+        ny = np.clip(self.y + self.direction_y * cell, top, self.world_h - cell)
+        gx = np.where(trying, nx // cell + 1, 0)
+        gy = np.where(trying, (ny - top) // cell + 1, 0)
+        ok = trying & (self.walls[np.arange(self.B)[:, None], gy, gx] == 0)
+        self.x = np.where(ok, nx, self.x)
+        self.y = np.where(ok, ny, self.y)
+        self.move_cooldown[ok] = self.move_cooldown_reset
+
+        # ---- Player Eat Player (players in list order, like Game.eat_players) ----
+        if self.P > 1 and self.touching(live).any():
+            self.eat_players(live)
+
+        # ---- Eat Dots (DotField.eat: earlier players win ties) ----
+        flat = self.dots.reshape(-1)
+        stride = self.W + 2
+        base = np.arange(self.B) * (self.H + 2) * stride
+        for p in range(self.P):
+            can = live & self.alive[:, p]
+            if not can.any():
+                continue
+            here = base + ((self.y[:, p] - top) // cell + 1) * stride + self.x[:, p] // cell + 1
+            here = np.where(can, here, 0)  # dead players read the (empty) border corner
+            for ox, oy, hit_normal, hit_pellet in self.reach:
+                idx = here + oy * stride + ox
+                v = flat[idx]
+                eat = can & (((v == NORMAL) & hit_normal) | ((v == PELLET) & hit_pellet))
+                if not eat.any():
+                    continue
+                pellet = eat & (v == PELLET)
+                flat[idx[eat]] = 0
+                self.n_dots -= eat
+                self.score[:, p] += np.where(pellet, 5, eat)
+                self.dots_eaten[:, p] += eat
+                self.power_mode[pellet, p] = True
+                self.power_timer[pellet, p] = 300
+
+        # ---- Power Mode Countdown ----
+        powered = live[:, None] & self.power_mode
+        self.power_timer -= powered
+        self.power_mode &= ~(powered & (self.power_timer <= 0))
+
+        # ---- Respawn Countdown (match rng, so one match at a time) ----
+        dead = live[:, None] & ~self.alive
+        self.respawn_timer -= dead
+        for b, p in zip(*np.nonzero(dead & (self.respawn_timer <= 0))):
+            self.alive[b, p] = True
+            x, y = self.mazes[b].get_valid_positions(1, exclude=Occupied(self, b))[0]
+            self.x[b, p], self.y[b, p] = x, y + top
+
+        # ---- Dot Spawn Timer ----
+        self.dot_timer += live
+        for b in np.flatnonzero(live & (self.n_dots == 0)):
+            self.add_dots(b, 50)
+        for b in np.flatnonzero(live & (self.dot_timer >= self.dot_intv)):
+            self.add_dots(b, self.dot_amt)
+
+        if self.max_ticks is not None:
+            self.done |= self.ticks >= self.max_ticks
+
+    def touching(self, live):
+        """(B,) True where two live players share a cell."""
+        alive = self.alive & live[:, None]
+        same = ((self.x[:, :, None] == self.x[:, None, :]) & (self.y[:, :, None] == self.y[:, None, :])
+                & alive[:, :, None] & alive[:, None, :])
+        return same.sum(axis=(1, 2)) > alive.sum(axis=1)
+
+    def eat_players(self, live):
+        touching = np.flatnonzero(self.touching(live))
+        for p in range(self.P):
+            for o in range(self.P):
+                if p == o:
+                    continue
+                b = touching
+                hit = (self.alive[b, p] & self.alive[b, o]
+                       & (self.x[b, p] == self.x[b, o]) & (self.y[b, p] == self.y[b, o])
+                       & (self.power_mode[b, p] | self.prey[p, o]))
+                b = b[hit]
+                if not len(b):
+                    continue
+                self.score[b, p] += np.where(self.power_mode[b, p], 15, 10)
+                self.kills[b, p] += 1
+                self.deaths[b, o] += 1
+                self.alive[b, o] = False
+                self.respawn_timer[b, o] = self.respawn_delay
+                self.x[b, o] = self.y[b, o] = -self.cell
+                self.power_mode[b, o] = False
+
+    def add_dots(self, b, n):
+        # Game.add_dots: as many as still fit, from the match's own rng
+        cells = self.mazes[b].get_valid_positions(n, exclude=Occupied(self, b), allow_fewer=True)
+        for x, y in cells:
+            self.dots[b, y // self.cell + 1, x // self.cell + 1] = NORMAL
+        self.n_dots[b] += len(cells)
+        self.dot_timer[b] = 0
+
+    # --------------------------------------------------
+    # Read back one match in Game terms
+    # --------------------------------------------------
+    def player_state(self, b, i):
+        """Player i of match b as a ``Player.get_state()`` tuple."""
+        return tuple(getattr(self, f)[b, i].item() for f in Player.STATE_FIELDS)
+
+    def dot_cells(self, b):
+        ys, xs = np.nonzero(self.dots[b])
+        return set(zip((xs - 1).tolist(), (ys - 1).tolist()))
+
+
+class Occupied:
+    """``(gx, gy) in occupied`` for one match: a dot or a live player there.
+
+    Stands in for ``Game.occupied_cells()`` when the batch asks the match's
+    Maze for spawn positions, without building the set.
+    """
+
+    def __init__(self, env, b):
+        self.env, self.b = env, b
+
+    def __contains__(self, cell):
+        env, b = self.env, self.b
+        gx, gy = cell
+        if env.dots[b, gy + 1, gx + 1]:
+            return True
+        px, py = gx * env.cell, gy * env.cell + env.top
+        return bool(np.any(env.alive[b] & (env.x[b] == px) & (env.y[b] == py)))
+
+
+# --------------------------------------------------
+# Self-check: the batch against the scalar engine on the same seeds
+# --------------------------------------------------
+def check_equivalence(seeds=range(8), ticks=3000, every=1, **options):
+    """Step ``BatchEnv`` and one ``Game`` per seed with the same random
+    actions and compare the full state every ``every`` ticks.
+
+    Returns the number of ticks compared; raises AssertionError at the first
+    difference.
+    """
+    seeds = list(seeds)
+    env = BatchEnv(seeds, max_ticks=ticks, **options)
+    games = [Game(None, seed=s, max_ticks=ticks, **options) for s in seeds]
+    walkers = [[RandomWalker(random.Random(s * 1000 + i)) for i in range(env.P)] for s in seeds]
+
+    def compare(tick):
+        for b, game in enumerate(games):
+            where = f"seed {seeds[b]}, tick {tick}"
+            assert env.ticks[b] == game.ticks and env.dot_timer[b] == game.dot_timer, where
+            assert env.done[b] == game.game_over, where
+            for i, p in enumerate(game.players):
+                assert env.player_state(b, i) == p.get_state(), f"{where}, player {p.id}"
+            dots = {(d.x // env.cell, (d.y - env.top) // env.cell) for d in game.dots}
+            assert env.dot_cells(b) == dots and env.n_dots[b] == len(game.dots), f"{where}, dots"
+            assert env.mazes[b].rng.getstate() == game.rng.getstate(), f"{where}, rng"
+
+    compare(0)
+    for tick in range(1, ticks + 1):
+        actions = [[w.act() for w in row] for row in walkers]
+        env.step(actions)
+        for game, row in zip(games, actions):
+            game.step(row)
+        if tick % every == 0 or tick == ticks:
+            compare(tick)
+    return ticks
+
+
+def benchmark(matches, ticks, **options):
+    """Match-ticks per second of the batch, with random actions."""
+    env = BatchEnv(range(matches), **options)
+    rng = np.random.default_rng(0)
+    actions = rng.integers(1, len(ACTION_DIRECTIONS), size=(ticks, matches, env.P))
+    start = time.perf_counter()
+    for a in actions:
+        env.step(a)
+    return matches * ticks / (time.perf_counter() - start)
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lockstep NumPy simulator for many matches")
+    parser.add_argument("--check", action="store_true",
+                        help="compare against Game on seeded runs instead of benchmarking")
+    parser.add_argument("--matches", type=int, default=256, help="matches stepped together")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--players", type=int, default=3)
+    parser.add_argument("--respawn-delay", type=int, default=180)
+    args = parser.parse_args(argv)
+    options = {"players": args.players, "respawn_delay": args.respawn_delay}
+
+    if args.check:
+        ticks = check_equivalence(range(args.matches), args.ticks, **options)
+        print(f"{args.matches} matches x {ticks} ticks: identical to Game")
+        return 0
+    rate = benchmark(args.matches, args.ticks, **options)
+    print(json.dumps({"matches": args.matches, "ticks": args.ticks,
+                      "match_ticks_per_s": round(rate)}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
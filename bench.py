@@ -0,0 +1,196 @@
+# bench.py — Frame-time benchmarks for update/render across arena sizes
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from game import Game
+from tournament import RandomWalker
+
+GRIDS = [(40, 26), (100, 100), (250, 250), (500, 500)]
+DOT_COUNTS = [200, 1000, 10000, 100000]
+PLAYER_COUNTS = [3, 16, 64]
+BACKENDS = ["field", "array"]
+MAX_WORLD_PX = 2000  # cell size shrinks so big grids still fit one surface
+
+
+def percentiles(samples):
+    s = sorted(samples)
+    pick = lambda q: s[min(len(s) - 1, int(q * len(s)))]
+    return {
+        "n": len(s),
+        "mean": round(sum(s) / len(s), 4),
+        "p50": round(pick(0.50), 4),
+        "p95": round(pick(0.95), 4),
+        "p99": round(pick(0.99), 4),
+    }
+
+
+def timed(fn, reps, warmup=5):
+    """Per-call durations of ``fn`` in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    out = []
+    clock = time.perf_counter
+    for _ in range(reps):
+        t = clock()
+        fn()
+        out.append((clock() - t) * 1000)
+    return out
+
+
+# --------------------------------------------------
+# Build an arena of the given size and fill it with exactly `dots` dots
+# --------------------------------------------------
+def make_game(grid, dots, backend, players=3, seed=0):
+    w, h = grid
+    cell = max(2, min(20, MAX_WORLD_PX // max(w, h)))
+    size = (w * cell, h * cell + Game.TOP_MARGIN)
+    game = Game(pygame.Surface(size), dot_backend=backend, size=size, cell=cell, seed=seed,
+                players=players)
+
+    game.dots = game.DOT_BACKENDS[backend](cell, Game.TOP_MARGIN)
+    free = game.maze.free_cells()
+    if dots > len(free):
+        return None
+    rng = random.Random(seed)
+    for i in rng.sample(free, dots):
+        y, x = divmod(i, game.maze.width)
+        game.dots.spawn(x * cell, y * cell + Game.TOP_MARGIN)
+    game.dot_intv = 10**9  # keep the dot count fixed while measuring
+    return game
+
+
+def bench_case(grid, dots, players, backend, frames):
+    game = make_game(grid, dots, backend, players)
+    if game is None:
+        return None
+    walkers = [RandomWalker(random.Random(i)) for i in range(len(game.players))]
+
+    def update():
+        for p, w in zip(game.players, walkers):
+            p.apply_action(w.act())
+        game.update()
+
+    maze = game.maze
+    occupied = game.occupied_cells()
+    results = {
+        "update": timed(update, frames),
+        "render": timed(game.render, frames),
+        "maze_draw": timed(lambda: maze.draw(game.screen, offset_y=game.TOP_MARGIN), frames),
+        "draw_scores": timed(game.draw_scores, frames),
+        "eat_player": timed(game.eat_players, frames),
+        "generate_maze": timed(maze.generate_maze, max(3, frames // 50)),
+        "get_valid_positions": timed(
+            lambda: maze.get_valid_positions(10, exclude=occupied, allow_fewer=True), frames),
+    }
+    # Every seat deciding at once: the worst case for the shared nav fields
+    game.set_bots("all")
+    results["bots"] = timed(game.run_bots, frames)
+    return {name: percentiles(samples) for name, samples in results.items()}
+
+
+def case_key(grid, dots, players, backend):
+    return f"grid={grid[0]}x{grid[1]} dots={dots} players={players} backend={backend}"
+
+
+def run(args):
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((1, 1))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "frames": args.frames,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+    for grid in args.grids:
+        for dots in args.dots:
+            for players in args.players:
+                for backend in args.backends:
+                    key = case_key(grid, dots, players, backend)
+                    res = bench_case(grid, dots, players, backend, args.frames)
+                    if res is None:
+                        print(f"skip {key}", file=sys.stderr)
+                        continue
+                    report["results"][key] = res
+                    print(f"{key:55s} update p50 {res['update']['p50']:8.3f} ms"
+                          f"  render p50 {res['render']['p50']:8.3f} ms", file=sys.stderr)
+    return report
+
+
+# --------------------------------------------------
+# Flag metrics whose p50 or p95 grew by more than `threshold` vs. a baseline;
+# changes smaller than `min_delta` ms are timer noise and never flagged
+# --------------------------------------------------
+def compare(report, baseline, threshold, min_delta=0.05):
+    regressions = []
+    for key, metrics in report["results"].items():
+        base = baseline["results"].get(key)
+        if not base:
+            continue
+        for name, stats in metrics.items():
+            old = base.get(name)
+            if not old:
+                continue
+            for q in ("p50", "p95"):
+                new = stats[q]
+                if new > old[q] * (1 + threshold) and new - old[q] > min_delta:
+                    regressions.append((key, name, q, old[q], new))
+    return regressions
+
+
+def parse_grid(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark Game.update/render and friends.")
+    ap.add_argument("--frames", type=int, default=200, help="samples per metric")
+    ap.add_argument("--grids", type=parse_grid, nargs="+", default=GRIDS, metavar="WxH")
+    ap.add_argument("--dots", type=int, nargs="+", default=DOT_COUNTS)
+    ap.add_argument("--players", type=int, nargs="+", default=PLAYER_COUNTS)
+    ap.add_argument("--backends", nargs="+", default=BACKENDS, choices=sorted(Game.DOT_BACKENDS))
+    ap.add_argument("--quick", action="store_true", help="smallest sweep, for a smoke run")
+    ap.add_argument("-o", "--output", default="bench_results.json")
+    ap.add_argument("--compare", metavar="BASELINE", help="flag regressions against a stored run")
+    ap.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown (0.15 = 15%%)")
+    ap.add_argument("--min-delta", type=float, default=0.05, help="ignore changes below this many ms")
+    args = ap.parse_args(argv)
+    if args.quick:
+        args.grids, args.dots, args.frames = [GRIDS[0], GRIDS[1]], [200, 1000], 50
+        args.players = PLAYER_COUNTS[:2]
+
+    report = run(args)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.min_delta)
+        for key, name, q, old, new in regressions:
+            print(f"REGRESSION {key} {name} {q}: {old:.3f} -> {new:.3f} ms")
+        if regressions:
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
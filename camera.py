@@ -0,0 +1,62 @@
+# camera.py — Scrolling view onto arenas larger than the window
+
+import pygame
+
+
+class Camera:
+    """Maps world pixels to the play area of the screen.
+
+    ``viewport`` is the screen rect the world is drawn into and ``world`` the
+    world bounds, both in pixels; world y includes the scoreboard margin so
+    that an arena which fits the window maps 1:1. ``rect`` is the part of the
+    world currently visible. With ``target`` set the camera keeps that player
+    centred; otherwise it frames every live player.
+    """
+
+    def __init__(self, viewport, world):
+        self.viewport = pygame.Rect(viewport)
+        self.world = pygame.Rect(world)
+        self.rect = pygame.Rect(self.world.topleft, self.viewport.size)
+        self.rect.clamp_ip(self.world)
+        self.target = None
+
+    @property
+    def scrolls(self):
+        """True when the world does not fit the viewport."""
+        return self.world.w > self.viewport.w or self.world.h > self.viewport.h
+
+    @property
+    def offset(self):
+        """Add to world coordinates to get screen coordinates."""
+        return self.viewport.x - self.rect.x, self.viewport.y - self.rect.y
+
+    def to_screen(self, x, y):
+        ox, oy = self.offset
+        return x + ox, y + oy
+
+    # --------------------------------------------------
+    # Follow one player, or None for all; TAB cycles all -> A -> B -> ...
+    # --------------------------------------------------
+    def follow(self, player):
+        self.target = player
+
+    def cycle(self, players):
+        order = [None] + list(players)
+        self.target = order[(order.index(self.target) + 1) % len(order)]
+
+    def update(self, players, cell):
+        if self.target is not None and self.target.alive:
+            shown = [self.target]
+        else:
+            shown = [p for p in players if p.alive]
+        if not shown:
+            return  # everyone is respawning; hold still
+        left = min(p.x for p in shown)
+        top = min(p.y for p in shown)
+        right = max(p.x for p in shown) + cell
+        bottom = max(p.y for p in shown) + cell
+        self.rect.center = ((left + right) // 2, (top + bottom) // 2)
+        self.rect.clamp_ip(self.world)
+
+    def visible(self, rect):
+        return self.rect.colliderect(rect)
@@ -3,6 +3,8 @@
 import pygame
 
 class Dot:
+    __slots__ = ("x", "y", "is_power_pellet", "radius", "color", "blink_counter")
+
     def __init__(self, x: int, y: int, base_radius: int, power: bool = False):
         """
         Parameters
@@ -20,22 +22,41 @@ class Dot:
         self.blink_counter = 0
 
     # ──────────────────────────────
-    def draw(self, screen: pygame.Surface):
-        """Draw the dot on screen; power pellets blink every 10 frames"""
+    @property
+    def visible(self) -> bool:
+        """Power pellets are hidden every other 10-frame window"""
+        return not self.is_power_pellet or (self.blink_counter // 10) % 2 == 0
+
+    def tick_blink(self) -> bool:
+        """Advance the blink animation one frame; True if visibility flipped"""
+        before = self.visible
+        self.blink_counter += 1
+        return self.visible != before
+
+    # ──────────────────────────────
+    def draw(self, screen: pygame.Surface, advance: bool = True, offset: tuple = (0, 0)):
+        """Draw the dot on screen; power pellets blink every 10 frames
+
+        ``advance=False`` redraws the current animation frame without ticking
+        it (dirty-rect rendering ticks pellets once per frame on its own).
+        ``offset`` shifts world coordinates to the screen (camera scrolling).
+        """
+        x, y = self.x + offset[0], self.y + offset[1]
         if self.is_power_pellet:
-            self.blink_counter += 1
+            if advance:
+                self.blink_counter += 1
             # Toggle visibility every 10 frames
             if (self.blink_counter // 10) % 2 == 0:
                 pygame.draw.circle(
                     screen,
                     self.color,
-                    (self.x + self.radius, self.y + self.radius),
+                    (x + self.radius, y + self.radius),
                     self.radius,
                 )
         else:
             pygame.draw.circle(
                 screen,
                 self.color,
-                (self.x + self.radius * 2, self.y + self.radius * 2),
+                (x + self.radius * 2, y + self.radius * 2),
                 self.radius,
             )
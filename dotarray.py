@@ -0,0 +1,229 @@
+# dotarray.py — Struct-of-arrays dot storage for very large arenas
+
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+from dot import Dot
+
+
+class DotArray:
+    """Drop-in alternative to ``DotField`` that keeps every dot in NumPy arrays.
+
+    Collisions against all players are resolved in one vectorized step and
+    drawing is a single ``Surface.blits`` call over two pre-rendered sprites
+    (normal dot and power pellet). Blink timing and scoring match ``Dot``.
+    """
+
+    def __init__(self, cell, top_margin, capacity=256):
+        self.cell = cell
+        self.top_margin = top_margin
+        self.base_radius = cell // 2
+        self.color = (255, 255, 255)
+
+        self._n = 0      # high-water mark of used slots
+        self._count = 0  # live dots
+        self._alloc(capacity)
+        self._sprites = None
+        self.dirty = None  # cells touched since pop_dirty(), while tracking
+        self.watchers = []  # told dot_added(gx, gy, power) / dot_removed(gx, gy)
+
+    def _alloc(self, capacity):
+        def grow(old, dtype):
+            new = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                new[:self._n] = old[:self._n]
+            return new
+
+        self.x = grow(getattr(self, "x", None), np.int32)
+        self.y = grow(getattr(self, "y", None), np.int32)
+        self.radius = grow(getattr(self, "radius", None), np.int32)
+        self.power = grow(getattr(self, "power", None), bool)
+        self.alive = grow(getattr(self, "alive", None), bool)
+        self.blink = grow(getattr(self, "blink", None), np.int32)
+
+    # --------------------------------------------------
+    def cell_of(self, x, y):
+        return x // self.cell, (y - self.top_margin) // self.cell
+
+    def spawn(self, x, y, power=False):
+        if self._n == len(self.x):
+            if self._count <= self._n // 2:
+                self.compact()
+            else:
+                self._alloc(2 * len(self.x))
+        i = self._n
+        self.x[i], self.y[i] = x, y
+        self.radius[i] = self.base_radius if power else self.base_radius // 2
+        self.power[i] = power
+        self.alive[i] = True
+        self.blink[i] = 0
+        self._n += 1
+        self._count += 1
+        if self.dirty is not None:
+            self.dirty.append(self.cell_of(x, y))
+        for w in self.watchers:
+            w.dot_added(*self.cell_of(x, y), power)
+        return i
+
+    def add(self, dot):
+        i = self.spawn(dot.x, dot.y, dot.is_power_pellet)
+        self.blink[i] = dot.blink_counter
+        return i
+
+    def compact(self):
+        """Squeeze eaten slots out while keeping spawn order."""
+        keep = np.flatnonzero(self.alive[:self._n])
+        n = len(keep)
+        for arr in (self.x, self.y, self.radius, self.power, self.alive, self.blink):
+            arr[:n] = arr[keep]
+            arr[n:self._n] = 0
+        self._n = n
+
+    def remove_at(self, gx, gy):
+        """Remove the dots in cell (gx, gy)."""
+        n = self._n
+        px, py = gx * self.cell, gy * self.cell + self.top_margin
+        idx = np.flatnonzero(self.alive[:n] & (self.x[:n] == px) & (self.y[:n] == py))
+        if not len(idx):
+            return
+        self.alive[idx] = False
+        self._count -= len(idx)
+        if self.dirty is not None:
+            self.dirty.append((gx, gy))
+        for w in self.watchers:
+            w.dot_removed(gx, gy)
+
+    def cells(self):
+        live = self.alive[:self._n]
+        gx, gy = self.cell_of(self.x[:self._n][live], self.y[:self._n][live])
+        return set(zip(gx.tolist(), gy.tolist()))
+
+    # --------------------------------------------------
+    # Same rule as Player.collides_with_dot, against every player at once.
+    # When two players touch the same dot the earlier player gets it.
+    # --------------------------------------------------
+    def eat(self, players):
+        live = [p for p in players if p.alive]
+        if not live or not self._count:
+            return []
+
+        n = self._n
+        x, y, r = self.x[:n], self.y[:n], self.radius[:n]
+        px = np.array([p.x for p in live], dtype=np.int64)[:, None]
+        py = np.array([p.y for p in live], dtype=np.int64)[:, None]
+        hit = (px + r - x) ** 2 + (py + r - y) ** 2 < (2 * r) ** 2
+        hit &= self.alive[:n]
+
+        idx = np.flatnonzero(hit.any(axis=0))
+        if not len(idx):
+            return []
+        owner = hit[:, idx].argmax(axis=0)
+        order = np.argsort(owner, kind="stable")
+        idx, owner = idx[order], owner[order]
+
+        self.alive[idx] = False
+        self._count -= len(idx)
+        if self.dirty is not None or self.watchers:
+            gx, gy = self.cell_of(self.x[idx], self.y[idx])
+            cells = list(zip(gx.tolist(), gy.tolist()))
+            if self.dirty is not None:
+                self.dirty.extend(cells)
+            for w in self.watchers:
+                for c in cells:
+                    w.dot_removed(*c)
+        return [(live[o], bool(pw)) for o, pw in zip(owner.tolist(), self.power[idx].tolist())]
+
+    # --------------------------------------------------
+    def _build_sprites(self):
+        def circle(radius):
+            surf = pygame.Surface((radius * 2, radius * 2))
+            surf.set_colorkey((0, 0, 0))
+            pygame.draw.circle(surf, self.color, (radius, radius), radius)
+            return surf
+        return circle(self.base_radius // 2), circle(self.base_radius)
+
+    def draw(self, screen):
+        """Draw all dots; power pellets blink every 10 frames like ``Dot.draw``."""
+        if self._count:
+            n = self._n
+            pellets = self.alive[:n] & self.power[:n]
+            self.blink[:n][pellets] += 1
+            self._blit(screen, self.alive[:n])
+
+    def _blit(self, screen, mask, offset=(0, 0)):
+        if self._sprites is None:
+            self._sprites = self._build_sprites()
+        dot_sprite, pellet_sprite = self._sprites
+
+        n = self._n
+        power = self.power[:n]
+        x, y, r = self.x[:n] + offset[0], self.y[:n] + offset[1], self.radius[:n]
+
+        normal = mask & ~power
+        screen.blits(zip(repeat(dot_sprite),
+                         zip((x[normal] + r[normal]).tolist(), (y[normal] + r[normal]).tolist())),
+                     doreturn=False)
+
+        shown = mask & power & ((self.blink[:n] // 10) % 2 == 0)
+        if shown.any():
+            screen.blits(zip(repeat(pellet_sprite), zip(x[shown].tolist(), y[shown].tolist())),
+                         doreturn=False)
+
+    # --------------------------------------------------
+    # Change tracking for dirty-rect rendering
+    # --------------------------------------------------
+    def track_changes(self, on=True):
+        self.dirty = [] if on else None
+
+    def pop_dirty(self):
+        """Cells where a dot appeared or vanished since the last call."""
+        if not self.dirty:
+            return []
+        cells, self.dirty = self.dirty, []
+        return cells
+
+    def tick_blink(self):
+        """Advance every pellet one frame; return the cells whose pellet flipped."""
+        n = self._n
+        pellets = np.flatnonzero(self.alive[:n] & self.power[:n])
+        if not len(pellets):
+            return []
+        before = (self.blink[pellets] // 10) % 2
+        self.blink[pellets] += 1
+        flipped = pellets[(self.blink[pellets] // 10) % 2 != before]
+        gx, gy = self.cell_of(self.x[flipped], self.y[flipped])
+        return list(zip(gx.tolist(), gy.tolist()))
+
+    def draw_cells(self, screen, cells):
+        """Redraw the dots in ``cells`` without advancing their animation."""
+        if not self._count or not cells:
+            return
+        n = self._n
+        gx, gy = self.cell_of(self.x[:n], self.y[:n])
+        keys = np.array([cx * 65536 + cy for cx, cy in cells], dtype=np.int64)
+        mask = self.alive[:n] & np.isin(gx.astype(np.int64) * 65536 + gy, keys)
+        self._blit(screen, mask)
+
+    def draw_view(self, screen, view, offset):
+        """Draw the dots inside ``view`` (world pixels) shifted by ``offset``.
+
+        Animation is not advanced; call ``tick_blink`` once per frame.
+        """
+        if not self._count:
+            return
+        n, c = self._n, self.cell
+        x, y = self.x[:n], self.y[:n]
+        mask = (self.alive[:n] & (x > view.left - c) & (x < view.right)
+                & (y > view.top - c) & (y < view.bottom))
+        self._blit(screen, mask, offset)
+
+    def __iter__(self):
+        for i in np.flatnonzero(self.alive[:self._n]).tolist():
+            d = Dot(int(self.x[i]), int(self.y[i]), self.base_radius, bool(self.power[i]))
+            d.blink_counter = int(self.blink[i])
+            yield d
+
+    def __len__(self):
+        return self._count
@@ -0,0 +1,143 @@
+# dotfield.py — Dots indexed by maze cell
+
+from dot import Dot
+
+
+class DotField:
+    """Dots stored in a dict keyed by grid cell.
+
+    Dots and players sit on cell-aligned pixel coordinates, so every dot a
+    player can touch under the ``Player.collides_with_dot`` rule lies in the
+    player's cell or one of its eight neighbours. Lookup and removal are O(1)
+    instead of a scan over every dot.
+    """
+
+    NEIGHBOURHOOD = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+    def __init__(self, cell, top_margin):
+        self.cell = cell
+        self.top_margin = top_margin
+        self._cells = {}  # (gx, gy) -> [Dot, ...]
+        self._count = 0
+        self._pellets = set()
+        self.dirty = None  # cells touched since pop_dirty(), while tracking
+        self.watchers = []  # told dot_added(gx, gy, power) / dot_removed(gx, gy)
+
+    # --------------------------------------------------
+    def cell_of(self, x, y):
+        return x // self.cell, (y - self.top_margin) // self.cell
+
+    def spawn(self, x, y, power=False):
+        dot = Dot(x, y, self.cell // 2, power)
+        self.add(dot)
+        return dot
+
+    def add(self, dot):
+        key = self.cell_of(dot.x, dot.y)
+        self._cells.setdefault(key, []).append(dot)
+        self._count += 1
+        if dot.is_power_pellet:
+            self._pellets.add(dot)
+        if self.dirty is not None:
+            self.dirty.append(key)
+        for w in self.watchers:
+            w.dot_added(*key, dot.is_power_pellet)
+
+    def remove(self, dot):
+        key = self.cell_of(dot.x, dot.y)
+        bucket = self._cells[key]
+        bucket.remove(dot)  # buckets almost always hold a single dot
+        if not bucket:
+            del self._cells[key]
+        self._count -= 1
+        self._pellets.discard(dot)
+        if self.dirty is not None:
+            self.dirty.append(key)
+        for w in self.watchers:
+            w.dot_removed(*key)
+
+    def remove_at(self, gx, gy):
+        """Remove the dots in cell (gx, gy)."""
+        for d in self._cells.get((gx, gy), ())[:]:
+            self.remove(d)
+
+    def at(self, gx, gy):
+        return self._cells.get((gx, gy), ())
+
+    def cells(self):
+        return self._cells.keys()
+
+    # --------------------------------------------------
+    # Remove every dot a live player touches; players earlier in the list
+    # win ties, exactly like the old nested scan
+    # --------------------------------------------------
+    def eat(self, players):
+        eaten = []
+        for p in players:
+            if not p.alive:
+                continue
+            gx, gy = self.cell_of(p.x, p.y)
+            for dx, dy in self.NEIGHBOURHOOD:
+                bucket = self._cells.get((gx + dx, gy + dy))
+                if not bucket:
+                    continue
+                for d in bucket[:]:
+                    if p.collides_with_dot(d):
+                        self.remove(d)
+                        eaten.append((p, d.is_power_pellet))
+        return eaten
+
+    # --------------------------------------------------
+    # Change tracking for dirty-rect rendering
+    # --------------------------------------------------
+    def track_changes(self, on=True):
+        self.dirty = [] if on else None
+
+    def pop_dirty(self):
+        """Cells where a dot appeared or vanished since the last call."""
+        if not self.dirty:
+            return []
+        cells, self.dirty = self.dirty, []
+        return cells
+
+    def tick_blink(self):
+        """Advance every pellet one frame; return the cells whose pellet flipped."""
+        return [self.cell_of(d.x, d.y) for d in self._pellets if d.tick_blink()]
+
+    # --------------------------------------------------
+    def draw(self, screen):
+        for bucket in self._cells.values():
+            for d in bucket:
+                d.draw(screen)
+
+    def draw_cells(self, screen, cells):
+        """Redraw the dots in ``cells`` without advancing their animation."""
+        for key in cells:
+            for d in self._cells.get(key, ()):
+                d.draw(screen, advance=False)
+
+    def draw_view(self, screen, view, offset):
+        """Draw the dots inside ``view`` (world pixels) shifted by ``offset``.
+
+        Visits whichever is smaller: the cells the view covers or the dots.
+        Animation is not advanced; call ``tick_blink`` once per frame.
+        """
+        gx0, gy0 = self.cell_of(view.left, view.top)
+        gx1, gy1 = self.cell_of(view.right - 1, view.bottom - 1)
+        if (gx1 - gx0 + 1) * (gy1 - gy0 + 1) < len(self._cells):
+            for gy in range(gy0, gy1 + 1):
+                for gx in range(gx0, gx1 + 1):
+                    for d in self._cells.get((gx, gy), ()):
+                        d.draw(screen, False, offset)
+        else:
+            for (gx, gy), bucket in self._cells.items():
+                if gx0 <= gx <= gx1 and gy0 <= gy <= gy1:
+                    for d in bucket:
+                        d.draw(screen, False, offset)
+
+    def __iter__(self):
+        for bucket in self._cells.values():
+            yield from bucket
+
+    def __len__(self):
+        return self._count
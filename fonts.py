@@ -0,0 +1,104 @@
+# fonts.py — Shared font registry and rendered-text cache
+
+import os
+from collections import OrderedDict
+
+import pygame
+
+# Fonts ship with the project; regular and bold faces, looked up by `bold`
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "fonts")
+FONT_FILES = {False: "DejaVuSans.ttf", True: "DejaVuSans-Bold.ttf"}
+
+
+def font_file(bold=False):
+    """Path of the bundled face for ``bold``, and whether bold must be faked.
+
+    Falls back to the regular face (emboldened), then to the font file that
+    comes with pygame itself. Never consults the system font database.
+    """
+    for want in (bold, False):
+        path = os.path.join(FONT_DIR, FONT_FILES[want])
+        if os.path.exists(path):
+            return path, bold and not want
+    default = pygame.font.get_default_font()
+    return os.path.join(os.path.dirname(pygame.__file__), default), False
+
+
+class FontRegistry:
+    """Creates each (name, size, bold, italic) font once and hands it out again.
+
+    Fonts load straight from files (see ``font_file``); ``name`` is kept as a
+    hint and cache key only. ``pygame.font.SysFont`` scans the system font
+    database, which is slow and often lacks Arial, so it is never used.
+    """
+
+    def __init__(self):
+        self._fonts = {}
+
+    def get(self, name, size, bold=False, italic=False):
+        key = (name, size, bold, italic)
+        font = self._fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            path, fake_bold = font_file(bold)
+            font = pygame.font.Font(path, size)
+            font.set_bold(fake_bold)
+            font.set_italic(italic)
+            self._fonts[key] = font
+        return font
+
+    def __len__(self):
+        return len(self._fonts)
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, colour, antialias)."""
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+        self.hits = self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._surfaces)}
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+
+    def clear(self):
+        self._surfaces.clear()
+        self.reset_stats()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+# --------------------------------------------------
+# Process-wide instances shared by Game, Player and the overlays
+# --------------------------------------------------
+registry = FontRegistry()
+text_cache = TextCache()
+
+
+def get_font(name, size, bold=False, italic=False):
+    return registry.get(name, size, bold=bold, italic=italic)
+
+
+def render_text(font, text, color, antialias=True):
+    return text_cache.render(font, text, color, antialias)
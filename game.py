@@ -1,106 +1,348 @@
 import pygame, random
-from player import Player
-from maze   import Maze
-from dot    import Dot
+from player import Player, player_specs
+from maze   import Maze, NoValidPositionError
+from occupancy import Occupancy
+from nav import NavGrid, BotController
+from dotfield import DotField
+from dotarray import DotArray
+from scoreboard import Scoreboard
+from fonts  import get_font
+from profiler import FrameProfiler, draw_overlay
+from camera import Camera
+from snapshot import Snapshot, DotBitmap
+from telemetry import DOT, PELLET, KILL, RESPAWN, WAVE
 
 
 class Game:
     # TOP_MARGIN = 60  # Scoreboard height
     TOP_MARGIN = 80
 
-    def __init__(self, screen):
+    # Non-movement keys the game reacts to
+    CONTROL_KEYS = {
+        pygame.K_ESCAPE,  # pause
+        pygame.K_r,       # restart after game over
+        pygame.K_F3,      # profiler overlay
+        pygame.K_F4,      # export profiler stats
+        pygame.K_F5,      # cProfile capture of the next 300 frames
+        pygame.K_TAB,     # camera: all players -> follow A -> B -> ...
+    }
+
+    # "field" suits the default arena; "array" scales to tens of thousands of dots
+    DOT_BACKENDS = {"field": DotField, "array": DotArray}
+
+    def __init__(self, screen=None, dot_backend="field", size=(800, 600),
+                 respawn_delay=180, dot_intv=600, dot_amt=10, move_cooldown=6,
+                 max_ticks=None, seed=None, cell=20, dirty_rects=False, grid=None,
+                 players=3, prey=None, bots=None):
+        """Pass ``screen=None`` for a headless game of logical ``size``.
+
+        A headless game never touches the display or font modules; drive it
+        with ``step(actions)`` or ``set_action`` + ``update()``. ``cell`` is the
+        grid cell size in pixels. The remaining arguments tune the rules;
+        ``max_ticks`` ends the match after that many ticks (``None`` plays
+        forever). All randomness comes from ``self.rng``, seeded with ``seed``
+        (a fresh one is drawn if omitted), so a seed plus the per-tick inputs
+        reproduce a match exactly.
+
+        With ``dirty_rects`` ``render()`` repaints only what changed and
+        returns the rects to pass to ``pygame.display.update``; otherwise it
+        redraws everything and returns None (flip the whole display).
+
+        ``grid=(w, h)`` sets the arena size in cells; by default the maze just
+        fills the screen. A larger arena is shown through a scrolling
+        ``Camera`` (dirty rects do not apply while it scrolls).
+
+        ``players`` is a head count or a list of ``[id, colour, keys]`` specs
+        (``keys`` is an (up, down, left, right) tuple, or None for a player
+        driven only by actions). ``prey`` maps each id to the ids it may eat;
+        by default every player hunts the next one, A -> B -> C -> A.
+        ``bots`` hands seats to ``nav.BotController``: ``"empty"`` for every
+        player without keys, ``"all"``, or a list of player ids.
+        """
+        if seed is None:
+            seed = random.randrange(2**32)
+        self._options = dict(dot_backend=dot_backend, size=size,
+                             respawn_delay=respawn_delay, dot_intv=dot_intv,
+                             dot_amt=dot_amt, move_cooldown=move_cooldown,
+                             max_ticks=max_ticks, seed=seed, cell=cell,
+                             dirty_rects=dirty_rects, grid=grid,
+                             players=players, prey=prey, bots=bots)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.recorder = None  # see replay.InputRecorder
+        self.telemetry = None  # see telemetry.Telemetry
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
         self.screen = screen
-        self.sw, self.sh = screen.get_width(), screen.get_height()
+        self.headless = screen is None
+        self.dot_backend = dot_backend
+        self.sw, self.sh = size if self.headless else screen.get_size()
         self.bg_color = (33, 47, 60)
 
         # ---------- Maze (excluding top 60px) ----------
-        self.cell = 20
-        self.maze = Maze(self.sw // self.cell,
-                         (self.sh - self.TOP_MARGIN) // self.cell,
-                         self.cell)
+        self.cell = cell
+        if grid is None:
+            grid = (self.sw // self.cell, (self.sh - self.TOP_MARGIN) // self.cell)
+        self.maze = Maze(grid[0], grid[1], self.cell, self.rng)
+        # World bounds in pixels; y includes the scoreboard margin
+        self.world_w = self.maze.width * self.cell
+        self.world_h = self.maze.height * self.cell + self.TOP_MARGIN
 
         # ---------- Players ----------
-        self.players = [
-            Player("A", (255,255,0), pygame.K_w,  pygame.K_s,   pygame.K_a, pygame.K_d),
-            Player("B", (255,0,0),   pygame.K_UP, pygame.K_DOWN,pygame.K_LEFT, pygame.K_RIGHT),
-            Player("C", (0,255,255), pygame.K_i,  pygame.K_k,   pygame.K_j, pygame.K_l),
-        ]
-        self.players[0].prey = self.players[1]
-        self.players[1].prey = self.players[2]
-        self.players[2].prey = self.players[0]
-
-        for p, (x, y) in zip(self.players, self.maze.get_valid_positions(3)):
+        specs = player_specs(players) if isinstance(players, int) else players
+        self.players = [Player(pid, tuple(color), *(keys or (None,) * 4))
+                        for pid, color, keys in specs]
+        self.set_prey(prey)
+
+        self.occupancy = Occupancy(self.cell, self.TOP_MARGIN)
+        for p, (x, y) in zip(self.players, self.spawn_positions(len(self.players))):
             p.x, p.y = x, y + self.TOP_MARGIN  # Move downward
+        self.occupancy.rebuild(self.players)
+
+        self._nav = None  # shared distance fields, built when a bot first asks
+        self.set_bots(bots)
 
         # ---------- Dots ----------
-        self.dots = []
+        self.dot_bitmap = DotBitmap(self.maze.width, self.maze.height)  # for snapshots
+        self.dots = self.DOT_BACKENDS[dot_backend](self.cell, self.TOP_MARGIN)
+        self.dots.track_changes(dirty_rects)
+        self.dot_bitmap.attach(self.dots)
         self.add_dots(200)
-        self.dot_timer, self.dot_intv, self.dot_amt = 0, 600, 10
+        self.dot_timer, self.dot_intv, self.dot_amt = 0, dot_intv, dot_amt
 
         # ---------- Game State ----------
         self.game_over = self.paused = False
-        self.font = pygame.font.SysFont("Arial", 24)
-        self.respawn_delay = 180  # 3s @ 60FPS
+        self.ticks, self.max_ticks = 0, max_ticks
+        self.respawn_delay = respawn_delay  # 3s @ 60FPS by default
+        self.camera = None
+        if not self.headless:
+            self.font = get_font("Arial", 24)
+            self.scoreboard = Scoreboard(self.players, self.sw, self.TOP_MARGIN, self.bg_color)
+            self.camera = Camera((0, self.TOP_MARGIN, self.sw, self.sh - self.TOP_MARGIN),
+                                 (0, self.TOP_MARGIN, self.world_w, self.world_h - self.TOP_MARGIN))
+
+        # ---------- Dirty-rect rendering ----------
+        self.dirty_rects = dirty_rects
+        self._full_redraw = True
+        self._background = None     # bg colour + maze walls, for restoring rects
+        self._background_version = None
+        self._player_rects = []     # where each player was drawn last frame
 
         for p in self.players:
             p.speed = self.cell 
+            p.MOVE_COOLDOWN = move_cooldown
+
+    # --------------------------------------------------
+    # Prey graph: `prey` maps a player id to the ids it may eat
+    # --------------------------------------------------
+    def set_prey(self, prey=None):
+        by_id = {p.id: p for p in self.players}
+        if len(by_id) != len(self.players):
+            raise ValueError("player ids must be unique")
+        if prey is None:
+            ring = self.players[1:] + self.players[:1]
+            prey = {p.id: [q.id] for p, q in zip(self.players, ring)}
+        for i, p in enumerate(self.players):
+            targets = prey.get(p.id, ())
+            unknown = [pid for pid in targets if pid not in by_id]
+            if unknown:
+                raise ValueError(f"unknown player ids in prey of {p.id}: {unknown}")
+            p.index = i
+            p.prey_set = {by_id[pid] for pid in targets}
+            p.prey = by_id[targets[0]] if targets else None
+
+    def set_bots(self, bots):
+        for p in self.players:
+            if bots == "all" or (bots == "empty" and p.key_up is None) \
+                    or (isinstance(bots, list) and p.id in bots):
+                p.controller = BotController()
+            else:
+                p.controller = None
+
+    @property
+    def navigation(self):
+        if self._nav is None:
+            self._nav = NavGrid(self.maze, self.dots)
+        return self._nav
+
+    def drop_navigation(self):
+        """Forget the NavGrid (the maze changed); it stops following the dots."""
+        if self._nav is not None:
+            self._nav.dots.watchers.remove(self._nav)
+            self._nav = None
+
+    def run_bots(self):
+        for p in self.players:
+            if p.controller is not None:
+                p.apply_action(p.controller.act(self, p))
+
+    def spawn_positions(self, n):
+        # Players start 3 cells apart; crowded arenas close the gap rather than fail
+        for min_dist in (3, 2):
+            try:
+                return self.maze.get_valid_positions(n, min_dist=min_dist)
+            except NoValidPositionError:
+                pass
+        return self.maze.get_valid_positions(n, min_dist=1)
 
     # --------------------------------------------------
     def add_dots(self, n):
-        for x, y in self.maze.get_valid_positions(n):
-            self.dots.append(Dot(x, y + self.TOP_MARGIN, self.cell // 2))
+        # A dot wave places as many dots as still fit between the existing ones
+        cells = self.maze.get_valid_positions(n, exclude=self.occupied_cells(), allow_fewer=True)
+        for x, y in cells:
+            self.dots.spawn(x, y + self.TOP_MARGIN)
+        if self.telemetry:
+            self.telemetry.emit(WAVE, self.ticks, target=len(cells))
+
+    def occupied_cells(self):
+        """Grid cells holding a dot or a live player."""
+        cells = set(self.dots.cells())
+        cells.update(self.occupancy.cells())
+        return cells
+
+    # --------------------------------------------------
+    # Programmatic input (headless runs, bots); see player.ACTION_*
+    # --------------------------------------------------
+    def set_action(self, index, action):
+        self.players[index].apply_action(action)
+
+    def step(self, actions):
+        """Apply one action per player, then advance one tick.
+
+        Seats with a ``controller`` ignore theirs: the bot steers, from its
+        own last heading, so bot matches replay the same whatever is passed.
+        """
+        for p, a in zip(self.players, actions):
+            if p.controller is None:
+                p.apply_action(a)
+        self.update()
+
+    # --------------------------------------------------
+    # Full simulation state; the maze is shared, never copied. Pass a
+    # previous snapshot as `into` to refill its player record and dot bitmap
+    # in place (the RNG state is still a fresh tuple each time).
+    # --------------------------------------------------
+    def snapshot(self, into=None):
+        if into is not None and into.fits(self):
+            into.capture(self)
+            return into
+        return Snapshot(self)
+
+    def restore(self, state):
+        if state.maze is not None and state.maze is not self.maze:
+            if (state.maze.width, state.maze.height) != (self.maze.width, self.maze.height):
+                raise ValueError("snapshot is from a maze of a different size")
+            self.maze = state.maze
+            self.drop_navigation()
+            self._background = None
+        state.apply(self)
+        self.occupancy.rebuild(self.players)
+        self.request_full_redraw()
+
+    # --------------------------------------------------
+    # New match in place (R after game over): the same as building
+    # Game(seed=seed, **options), but keeps the players, screen and caches.
+    # The maze is a new object, so snapshots of the old match keep theirs.
+    # --------------------------------------------------
+    def reset(self, seed=None):
+        if seed is None:
+            seed = random.randrange(2**32)
+        self._options["seed"] = self.seed = seed
+        if self.telemetry:
+            self.telemetry.start(self)  # summarises the old match first
+        self.rng.seed(seed)
+        self.maze = Maze(self.maze.width, self.maze.height, self.cell, self.rng)
+        self.drop_navigation()
+        self._background = None
+        for p in self.players:
+            p.reset()
+        for p, (x, y) in zip(self.players, self.spawn_positions(len(self.players))):
+            p.x, p.y = x, y + self.TOP_MARGIN
+        self.occupancy.rebuild(self.players)
+
+        self.dots = self.DOT_BACKENDS[self.dot_backend](self.cell, self.TOP_MARGIN)
+        self.dots.track_changes(self.dirty_rects)
+        self.dot_bitmap.attach(self.dots)
+        self.add_dots(200)
+        self.dot_timer = self.ticks = 0
+        self.game_over = self.paused = False
+        self.request_full_redraw()
 
     # --------------------------------------------------
     def handle_event(self, ev):
         if ev.type == pygame.KEYDOWN:
             if ev.key == pygame.K_ESCAPE:
                 self.paused = not self.paused
+                self.request_full_redraw()
             elif ev.key == pygame.K_r and self.game_over:
-                self.__init__(self.screen)
+                self.reset()  # new maze
+                if self.recorder:
+                    self.recorder.start(self)
+            elif ev.key == pygame.K_F3:
+                self.show_profiler = not self.show_profiler
+                self.profiler.enabled = self.show_profiler
+                self.request_full_redraw()
+            elif ev.key == pygame.K_F4:
+                print(f"Profiler stats written to {self.profiler.export()}")
+            elif ev.key == pygame.K_F5:
+                print(f"Capturing cProfile to {self.profiler.capture()}")
+            elif ev.key == pygame.K_TAB and self.camera:
+                self.camera.cycle(self.players)
             for p in self.players:
-                p.handle_key_down(ev.key)
+                if p.controller is None:
+                    p.handle_key_down(ev.key)
 
         elif ev.type == pygame.KEYUP:
             for p in self.players:
-                p.handle_key_up(ev.key)
+                if p.controller is None:
+                    p.handle_key_up(ev.key)
+
+        elif ev.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+            self.request_full_redraw()
 
     # --------------------------------------------------
     def update(self):
         if self.paused or self.game_over: return
+        prof = self.profiler if self.profiler.enabled else None
+        if prof: prof.start()
+
+        # ---- Bots pick their actions (before recording, so replays see them) ----
+        self.run_bots()
+        if prof: prof.lap("bots")
+        if self.recorder: self.recorder.record(self)
+        self.ticks += 1
 
         # ---- Player Movement ----
+        occupancy = self.occupancy
         for p in self.players:
-            nx, ny = p.calculate_new_position(self.cell, self.maze, self.TOP_MARGIN)
-            p.x, p.y = nx, ny
+            nx, ny = p.calculate_new_position(self.cell, self.maze, self.TOP_MARGIN,
+                                              (self.world_w, self.world_h))
+            if nx != p.x or ny != p.y:
+                p.x, p.y = nx, ny
+                occupancy.move(p)
+        if prof: prof.lap("movement")
 
         # ---- Player Eat Player ----
-        for p in self.players:
-            if not p.alive: continue
-            for o in self.players:
-                if p is o or not o.alive: continue
-                if p.collides_with(o, self.cell):
-                    if p.power_mode or o == p.prey:
-                        p.score += 15 if p.power_mode else 10
-                        o.alive = False
-                        o.respawn_timer = self.respawn_delay
-                        o.x = o.y = -self.cell
-                        o.power_mode = False
+        self.eat_players()
+        if prof: prof.lap("eat_player")
 
         # ---- Eat Dots ----
-        for p in self.players:
-            if not p.alive: continue
-            for d in self.dots[:]:
-                if p.collides_with_dot(d):
-                    p.score += 5 if d.is_power_pellet else 1
-                    if d.is_power_pellet:
-                        p.power_mode, p.power_timer = True, 300
-                    self.dots.remove(d)
+        tel = self.telemetry
+        for p, power in self.dots.eat(self.players):
+            p.score += 5 if power else 1
+            p.dots_eaten += 1
+            if power:
+                p.power_mode, p.power_timer = True, 300
+            if tel:
+                tel.emit(PELLET if power else DOT, self.ticks, p.index, -1, *self.occupancy.cell_of(p.x, p.y))
+        if prof: prof.lap("eat_dots")
 
         # ---- Power Mode Countdown ----
         for p in self.players:
             if p.power_mode:
                 p.power_timer -= 1
                 if p.power_timer <= 0: p.power_mode = False
+        if prof: prof.lap("power")
 
         # ---- Respawn Countdown ----
         for p in self.players:
@@ -108,8 +350,12 @@ class Game:
                 p.respawn_timer -= 1
                 if p.respawn_timer <= 0:
                     p.alive = True
-                    x, y = self.maze.get_valid_positions(1)[0]
+                    x, y = self.maze.get_valid_positions(1, exclude=self.occupied_cells())[0]
                     p.x, p.y = x, y + self.TOP_MARGIN
+                    occupancy.add(p)
+                    if tel:
+                        tel.emit(RESPAWN, self.ticks, p.index, -1, *occupancy.cell_of(p.x, p.y))
+        if prof: prof.lap("respawn")
 
         # ---- Dot Spawn Timer ----
         self.dot_timer += 1
@@ -117,158 +363,176 @@ class Game:
             self.add_dots(50); self.dot_timer = 0
         elif self.dot_timer >= self.dot_intv:
             self.add_dots(self.dot_amt); self.dot_timer = 0
+        if prof:
+            prof.lap("dot_spawn")
+            if self.headless: prof.end_frame()
+
+        if self.max_ticks is not None and self.ticks >= self.max_ticks:
+            self.game_over = True
+            if tel:
+                tel.match_over(self)
+
+    # --------------------------------------------------
+    # Predator eats prey, power mode eats anyone. Only players in
+    # neighbouring cells can touch; the occupancy map hands them over in list
+    # order, so ties resolve exactly as an all-pairs scan would.
+    # --------------------------------------------------
+    def eat_players(self):
+        for p in self.players:
+            if not p.alive: continue
+            for o in self.occupancy.near(p):
+                if p is o or not o.alive: continue
+                if p.collides_with(o, self.cell):
+                    if p.power_mode or o in p.prey_set:
+                        if self.telemetry:
+                            self.telemetry.emit(KILL, self.ticks, p.index, o.index,
+                                                *self.occupancy.cell_of(o.x, o.y))
+                        p.score += 15 if p.power_mode else 10
+                        p.kills += 1
+                        o.deaths += 1
+                        o.alive = False
+                        o.respawn_timer = self.respawn_delay
+                        self.occupancy.remove(o)
+                        o.x = o.y = -self.cell
+                        o.power_mode = False
 
     # --------------------------------------------------
     def render(self):
+        if self.headless:
+            raise RuntimeError("a headless Game has no screen to render to")
+        if self.camera.scrolls:
+            return self.render_camera()
+        if self.dirty_rects and not self._full_redraw and not self.show_profiler \
+                and self._background_version == self.maze.version:
+            return self.render_dirty()
+
+        prof = self.profiler if self.profiler.enabled else None
+        if prof: prof.start()
         self.screen.fill(self.bg_color)
+        if prof: prof.lap("fill")
 
         # Draw scoreboard before maze (so maze walls don’t cover it)
         self.draw_scores()
+        if prof: prof.lap("scores")
         self.maze.draw(self.screen, offset_y=self.TOP_MARGIN)
+        if prof: prof.lap("maze")
 
-        for d in self.dots: d.draw(self.screen)
+        self.dots.draw(self.screen)
+        if prof: prof.lap("dots")
         for p in self.players: p.draw(self.screen, self.cell)
+        if prof:
+            prof.lap("players")
+            prof.end_frame()
+
+        if self.show_profiler:
+            draw_overlay(self.screen, self.profiler)
+
+        if not self.dirty_rects:
+            return None
+        # Everything is on screen now; start tracking changes from here
+        self.background()
+        self.dots.pop_dirty()
+        self._player_rects = [self.player_rect(p) for p in self.players]
+        self._full_redraw = False
+        return [self.screen.get_rect()]
 
     # --------------------------------------------------
-    # Scoreboard
+    # Camera path for arenas larger than the screen: only the maze chunks,
+    # dots and players inside the view are drawn
     # --------------------------------------------------
-    def draw_scores(self):
-        pad = 6
-        col_w = self.sw // len(self.players)
-
-        # --------------------
-        # Background gradient & border
-        # --------------------
-        grad = pygame.Surface((self.sw, self.TOP_MARGIN), pygame.SRCALPHA)
-        base_color = (22, 160, 133)
-        for y in range(self.TOP_MARGIN):
-            grad.fill((*base_color, 230), pygame.Rect(0, y, self.sw, 1))
-        self.screen.blit(grad, (0, 0))
-        pygame.draw.rect(
-            self.screen,
-            (247, 220, 111),
-            pygame.Rect(0, 0, self.sw, self.TOP_MARGIN),
-            width=2,
-            border_radius=8
-        )
-
-        # --------------------
-        # Row 1: predator -> prey and controls
-        # --------------------
-        y_baseline = 8  # vertical start for icons & keys
-
-        def make_circle_surf(color, radius=8):
-            surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, color, (radius, radius), radius)
-            return surf
-
-        def make_arrow_surf(width=20, height=16, color=(255,255,255), thickness=6):
-            surf = pygame.Surface((width, height), pygame.SRCALPHA)
-            pygame.draw.rect(
-                surf,
-                color,
-                (0, (height-thickness)//2, width-height//2, thickness)
-            )
-            pygame.draw.polygon(
-                surf,
-                color,
-                [(width-height//2, 0), (width, height//2), (width-height//2, height)]
-            )
-            return surf
-
-        arrow_surf = make_arrow_surf()
-        icon_height = arrow_surf.get_height()  # 16px
-
-        key_layouts = [
-            ["W", "A", "S", "D"],
-            ["↑", "←", "↓", "→"],
-            ["I", "J", "K", "L"],
-        ]
-        box_w, box_h = 28, 28
-        box_gap    = 6
-        font_small = pygame.font.SysFont("Arial", 14)
-
-        # center-line for icons and boxes
-        icon_center_y = y_baseline + icon_height / 2
-        box_y = int(icon_center_y - box_h / 2)
-
-        for i, p in enumerate(self.players):
-            x0 = i * col_w + pad
-
-            # draw predator -> prey
-            pieces = [
-                make_circle_surf(p.color),
-                pygame.Surface((6,1), pygame.SRCALPHA),
-                arrow_surf,
-                pygame.Surface((6,1), pygame.SRCALPHA),
-                make_circle_surf(p.prey.color if p.prey else (90,90,90))
-            ]
-            cur_x = x0
-            for piece in pieces:
-                self.screen.blit(piece, (cur_x, y_baseline))
-                cur_x += piece.get_width()
-
-            cur_x += 6  # small gap before controls
-
-            # draw control keys, horizontally aligned with icons
-            for j, key in enumerate(key_layouts[i]):
-                bx = cur_x + j * (box_w + box_gap)
-                by = box_y
-                box_rect = pygame.Rect(bx, by, box_w, box_h)
-
-                pygame.draw.rect(self.screen, (50,50,50), box_rect, border_radius=6)
-                pygame.draw.rect(self.screen, p.color, box_rect, width=2, border_radius=6)
-
-                key_surf = font_small.render(key, True, (255,255,255))
-                kx = bx + (box_w - key_surf.get_width()) // 2
-                ky = by + (box_h - key_surf.get_height()) // 2
-                self.screen.blit(key_surf, (kx, ky))
-
-        # --------------------
-        # Row 2: player cards (closer margin = 4px)
-        # --------------------
-        card_h = 26
-        content_height = max(icon_height, box_h)
-        vertical_margin = 4  # <-- was 8, now 4 for tighter spacing
-        base_y = y_baseline + content_height + vertical_margin
-        font_score = pygame.font.SysFont("Arial", 18, bold=True)
+    def render_camera(self):
+        prof = self.profiler if self.profiler.enabled else None
+        if prof: prof.start()
+        screen, camera = self.screen, self.camera
+        camera.update(self.players, self.cell)
+        view, offset = camera.rect, camera.offset
+        screen.fill(self.bg_color)
+        if prof: prof.lap("fill")
 
-        for i, p in enumerate(self.players):
-            x0 = i * col_w + pad
-            card_rect = pygame.Rect(x0, base_y, col_w - 2*pad, card_h)
-
-            pygame.draw.rect(self.screen, (30,30,30,220), card_rect, border_radius=10)
-            pygame.draw.rect(self.screen, p.color, card_rect, width=2, border_radius=10)
-
-            # avatar
-            pygame.draw.circle(
-                self.screen,
-                p.color if p.alive else (90,90,90),
-                (x0 + 15, base_y + card_h//2),
-                10,
-                0 if p.alive else 2
-            )
-
-            # score
-            score_surf = font_score.render(str(p.score), True, (255,255,255))
-            self.screen.blit(
-                score_surf,
-                (x0 + 35, base_y + card_h//2 - score_surf.get_height()//2)
-            )
-
-            # extra timer
-            extra = ""
-            if p.power_mode:
-                extra = f"{p.power_timer//60 + 1}s"
-            elif not p.alive:
-                extra = f"{p.respawn_timer//60 + 1}s"
-            if extra:
-                color_extra = (255,215,0) if p.power_mode else (200,200,200)
-                extra_surf = font_small.render(extra, True, color_extra)
-                self.screen.blit(
-                    extra_surf,
-                    (card_rect.right - extra_surf.get_width() - 6,
-                    base_y + card_h//2 - extra_surf.get_height()//2)
-                )
+        self.draw_scores()
+        if prof: prof.lap("scores")
+        screen.set_clip(camera.viewport)
+        self.maze.draw_view(screen, view.move(0, -self.TOP_MARGIN), camera.viewport.topleft)
+        if prof: prof.lap("maze")
+
+        self.dots.tick_blink()
+        self.dots.draw_view(screen, view, offset)
+        if prof: prof.lap("dots")
+        for p in self.players:
+            if camera.visible(self.player_rect(p)):
+                p.draw(screen, self.cell, offset)
+        screen.set_clip(None)
+        if prof:
+            prof.lap("players")
+            prof.end_frame()
+
+        if self.show_profiler:
+            draw_overlay(screen, self.profiler)
+        if not self.dirty_rects:
+            return None
+        self.dots.pop_dirty()  # the whole view moves; nothing to track
+        return [screen.get_rect()]
+
+    def request_full_redraw(self):
+        """Make the next render() repaint the whole screen (pause, restart, resize)."""
+        self._full_redraw = True
+
+    def player_rect(self, p):
+        return pygame.Rect(p.x, p.y, self.cell, self.cell)
 
+    # --------------------------------------------------
+    # Dirty-rect path: repaint only cells whose dots or players changed,
+    # restoring what is underneath from the cached background layer
+    # --------------------------------------------------
+    def render_dirty(self):
+        prof = self.profiler if self.profiler.enabled else None
+        if prof: prof.start()
+        screen, cell = self.screen, self.cell
+
+        dirty = self.scoreboard.draw_dirty(screen)
+        if prof: prof.lap("scores")
+
+        cells = set(self.dots.pop_dirty())
+        cells.update(self.dots.tick_blink())
+        rects = [pygame.Rect(gx * cell, gy * cell + self.TOP_MARGIN, cell, cell) for gx, gy in cells]
+        # Pac-Man mouths animate, so players are redrawn every frame
+        new_player_rects = [self.player_rect(p) for p in self.players]
+        rects += self._player_rects + new_player_rects
+        self._player_rects = new_player_rects
+
+        play_area = pygame.Rect(0, self.TOP_MARGIN, self.sw, self.sh - self.TOP_MARGIN)
+        rects = [r.clip(play_area) for r in rects]
+        rects = [r for r in rects if r.w and r.h]
+        background = self.background()
+        for r in rects:
+            screen.blit(background, r, r)
+        if prof: prof.lap("restore")
+
+        covered = set()
+        for r in rects:
+            for gx in range(r.left // cell, (r.right - 1) // cell + 1):
+                for gy in range((r.top - self.TOP_MARGIN) // cell, (r.bottom - 1 - self.TOP_MARGIN) // cell + 1):
+                    covered.add((gx, gy))
+        self.dots.draw_cells(screen, covered)
+        if prof: prof.lap("dots")
+        for p in self.players: p.draw(screen, cell)
+        if prof:
+            prof.lap("players")
+            prof.end_frame()
+        return dirty + rects
+
+    def background(self):
+        """Background colour plus maze walls, rebuilt when the maze changes."""
+        if self._background is None or self._background_version != self.maze.version:
+            self._background = pygame.Surface((self.sw, self.sh))
+            self._background.fill(self.bg_color)
+            self.maze.draw(self._background, offset_y=self.TOP_MARGIN)
+            self._background_version = self.maze.version
+        return self._background
 
+    # --------------------------------------------------
+    # Scoreboard
+    # --------------------------------------------------
+    def draw_scores(self):
+        """Blit the cached scoreboard; return the screen rects that changed."""
+        return self.scoreboard.draw(self.screen)
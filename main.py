@@ -1,32 +1,112 @@
-import pygame
+import time
+_START = time.perf_counter()  # before the heavy imports, for --profile-startup
+
+import argparse
+import os
 import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+# pygame.pkgdata imports pkg_resources (over 100 ms) just to locate pygame's
+# own data files, and falls back to plain paths when it is unavailable.
+# Block it only while pygame loads, so later imports of it still work.
+_BLOCK_PKG_RESOURCES = "pkg_resources" not in sys.modules
+if _BLOCK_PKG_RESOURCES:
+    sys.modules["pkg_resources"] = None
+
+import pygame
+if _BLOCK_PKG_RESOURCES:
+    del sys.modules["pkg_resources"]
+import maze
 from game import Game
+from replay import InputRecorder
+from telemetry import Telemetry
+from timestep import FixedTimestep
+_IMPORTED = time.perf_counter()
+
+
 class InvalidKeyError(Exception):
     pass
 
+
+def print_startup(marks):
+    """--profile-startup: time spent in each phase up to the first frame."""
+    prev, total = _START, 0.0
+    for name, t in marks:
+        ms = (t - prev) * 1000
+        total += ms
+        print(f"{name:12s} {ms:8.1f} ms")
+        prev = t
+    print(f"{'total':12s} {total:8.1f} ms")
+
 def main():
-    # Initialize pygame
-    pygame.init()
+    ap = argparse.ArgumentParser(description="3-Player Pac-Man")
+    ap.add_argument("--seed", type=int, help="play a reproducible match")
+    ap.add_argument("--record", metavar="PATH", help="save the match inputs for replay.py")
+    ap.add_argument("--dirty-rects", action="store_true",
+                    help="repaint and push only the changed parts of the screen")
+    ap.add_argument("--players", type=int, default=3,
+                    help="head count; players beyond the third have no keys")
+    ap.add_argument("--bots", action="store_true",
+                    help="computer players take the seats without keys")
+    ap.add_argument("--grid", metavar="WxH", type=lambda s: tuple(int(n) for n in s.lower().split("x")),
+                    help="arena size in cells; larger than the window scrolls with the players")
+    ap.add_argument("--tick-rate", type=int, default=60, help="simulation ticks per second")
+    ap.add_argument("--fps", type=int, default=60, help="render cap; 0 renders as fast as possible")
+    ap.add_argument("--vsync", action="store_true", help="pace rendering by the display refresh")
+    ap.add_argument("--max-steps", type=int, default=5,
+                    help="most ticks run per frame when behind; the rest are dropped")
+    ap.add_argument("--maze-cache", metavar="DIR",
+                    help="keep generated large mazes here and reuse them on restart")
+    ap.add_argument("--telemetry", metavar="PATH",
+                    help="log match events to PATH (.jsonl, or .db for SQLite)")
+    ap.add_argument("--profile-startup", action="store_true",
+                    help="print how long imports, init and the first frame took, then quit")
+    args = ap.parse_args()
+    if args.maze_cache:
+        maze.set_cache_dir(args.maze_cache)
+
+    # Initialize only what the game uses (no audio or joystick)
+    marks = [("imports", _IMPORTED)]
+    pygame.display.init()
+    pygame.font.init()
+    marks.append(("init", time.perf_counter()))
     
     # Set up the display
     screen_width = 800
     screen_height = 600
-    screen = pygame.display.set_mode((screen_width, screen_height))
+    if args.vsync:
+        try:
+            # SDL only honours vsync on an accelerated (SCALED) window
+            screen = pygame.display.set_mode((screen_width, screen_height), pygame.SCALED, vsync=1)
+        except pygame.error as e:
+            print(f"vsync unavailable ({e}); using --fps {args.fps}")
+            args.vsync = False
+    if not args.vsync:
+        screen = pygame.display.set_mode((screen_width, screen_height))
     pygame.display.set_caption("3-Player Pac-Man")
+    # Show the window before building the match (maze, fonts, sprites)
+    screen.fill((33, 47, 60))
+    pygame.display.flip()
+    marks.append(("window", time.perf_counter()))
     
     # Create game instance
-    game = Game(screen)
+    game = Game(screen, seed=args.seed, dirty_rects=args.dirty_rects, grid=args.grid,
+                players=args.players, bots="empty" if args.bots else None)
+    recorder = InputRecorder(game) if args.record else None
+    telemetry = Telemetry(game, args.telemetry) if args.telemetry else None
+    marks.append(("game setup", time.perf_counter()))
     
-    # Game loop
+    # Game loop: fixed-rate ticks, rendering at --fps (or vsync)
     clock = pygame.time.Clock()
+    timestep = FixedTimestep(args.tick_rate, args.max_steps)
     running = True
 
-    # Valid keys for all players
+    # Valid keys for all players, plus pause/restart/profiler controls
     valid_keys = {
         pygame.K_w, pygame.K_s, pygame.K_a, pygame.K_d,  # Player A
         pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT,  # Player B
         pygame.K_i, pygame.K_k, pygame.K_j, pygame.K_l  # Player C
-    }
+    } | Game.CONTROL_KEYS
 
     # Main game loop
     while running:
@@ -44,19 +124,35 @@ def main():
             else:
                 game.handle_event(event)
         
-        # Update game state
-        game.update()
+        # Update game state: as many ticks as real time calls for
+        for _ in range(timestep.steps()):
+            game.update()
         
         # Render the game
-        game.render()
+        dirty = game.render()
         
         # Update the display
-        pygame.display.flip()
+        if dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        if args.profile_startup:
+            marks.append(("first frame", time.perf_counter()))
+            print_startup(marks)
+            running = False
         
-        # Cap the frame rate
-        clock.tick(60)
+        # Cap the frame rate (vsync already waits in flip)
+        clock.tick(0 if args.vsync else args.fps)
     
     # Clean up
+    print(timestep.report())
+    if telemetry:
+        telemetry.close(game)
+        print(f"Logged {telemetry.count} events to {args.telemetry}"
+              + (f" ({telemetry.dropped} dropped)" if telemetry.dropped else ""))
+    if recorder:
+        recorder.save(args.record)
+        print(f"Recorded {len(recorder.log)} ticks (seed {game.seed}) to {args.record}")
     pygame.quit()
     sys.exit()
 
@@ -1,33 +1,253 @@
+import os
+import numpy as np
 import pygame
 import random
+from collections import OrderedDict
+
+# Generated mazes are cached here as .npy files (memory-mapped on load) when
+# set, e.g. by `main.py --maze-cache DIR` or tournament workers inheriting it
+CACHE_DIR = os.environ.get("PACMAN_MAZE_CACHE")
+CACHE_MIN_CELLS = 256 * 256  # smaller mazes generate faster than they load
+
+
+def set_cache_dir(path):
+    """Cache mazes under ``path`` (None turns caching off); processes
+    started afterwards, such as tournament workers, inherit it."""
+    global CACHE_DIR
+    CACHE_DIR = path
+    if path:
+        os.environ["PACMAN_MAZE_CACHE"] = path
+    else:
+        os.environ.pop("PACMAN_MAZE_CACHE", None)
+
+
+class NoValidPositionError(ValueError):
+    """Raised when the maze cannot fit the requested number of positions."""
+
+
+# --------------------------------------------------
+# Union-find over node ids 0..n-1 given as parallel edge arrays. Each round
+# hooks the larger root of every edge under the smaller and then compresses
+# paths fully, so roots end up as the smallest id in their component.
+# --------------------------------------------------
+def union_roots(n, a, b):
+    parent = np.arange(n, dtype=np.int32)
+    while len(a):
+        ra, rb = parent[a], parent[b]
+        apart = ra != rb
+        a, b, ra, rb = a[apart], b[apart], ra[apart], rb[apart]
+        if not len(a):
+            break
+        parent[np.maximum(ra, rb)] = np.minimum(ra, rb)
+        while True:
+            up = parent[parent]
+            if np.array_equal(up, parent):
+                break
+            parent = up
+    return parent
+
+
+# --------------------------------------------------
+# Connected components of the open cells (4-neighbour), fully vectorized.
+# Cells are grouped into horizontal runs first, and only the leftmost
+# vertical contact between two runs becomes an edge. Every open cell is
+# labelled with the smallest flat index in its component; walls get -1.
+# --------------------------------------------------
+def label_components(open_):
+    h, w = open_.shape
+    starts = open_.copy()
+    starts[:, 1:] &= ~open_[:, :-1]
+    run = np.cumsum(starts.ravel(), dtype=np.int32) - 1  # run id of every open cell
+    run_start = np.flatnonzero(starts).astype(np.int32)   # flat index each run begins at
+
+    touch = open_[:-1] & open_[1:]
+    touch[:, 1:] &= ~touch[:, :-1]  # same two runs as the contact to the left
+    below = np.flatnonzero(touch)
+    parent = union_roots(len(run_start), run[below], run[below + w])
+
+    labels = np.full(h * w, -1, dtype=np.int32)
+    cells = np.flatnonzero(open_)
+    labels[cells] = run_start[parent[run[cells]]]
+    return labels.reshape(h, w)
+
+
+# --------------------------------------------------
+# Open interior walls until all open cells form one region. Each round a
+# component opens one wall it shares with a lower-labelled component (a
+# one-cell bridge); components with no such wall anywhere around them (sealed
+# in by thick walls) instead open every wall along their edge. Labels are
+# patched after each round by a union-find over just the opened cells and
+# the components they touch.
+# --------------------------------------------------
+def connect(grid):
+    h, w = grid.shape
+    flat = grid.reshape(-1)
+    labels = label_components(grid == 0).reshape(-1)
+    inner = np.zeros((h, w), dtype=bool)
+    inner[1:-1, 1:-1] = grid[1:-1, 1:-1] == 1
+    walls = np.flatnonzero(inner)
+    steps = (-w, w, -1, 1)
+    while True:
+        roots = np.flatnonzero(labels == np.arange(h * w, dtype=np.int32))
+        if len(roots) <= 1:
+            return grid
+
+        around = np.stack([labels[walls + d] for d in steps])
+        hi = around.max(axis=0)
+        lo = np.where(around >= 0, around, h * w).min(axis=0)
+        bridge = lo < hi
+        joins = hi[bridge]
+        _, first = np.unique(joins, return_index=True)
+        opened = walls[bridge][first]
+
+        # label -1 indexes the last slot, which stays False
+        stranded = np.zeros(h * w + 1, dtype=bool)
+        stranded[roots] = True
+        stranded[joins] = stranded[lo[bridge]] = False
+        if stranded.any():
+            edge = stranded[around].any(axis=0)
+            opened = np.union1d(opened, walls[edge])
+
+        flat[opened] = 0
+        labels[opened] = opened
+        walls = walls[flat[walls] == 1]
+        a = np.tile(opened, 4)
+        b = np.concatenate([labels[opened + d] for d in steps])
+        a, b = a[b >= 0], b[b >= 0]
+        nodes, pairs = np.unique(np.concatenate([a, b]), return_inverse=True)
+        parent = union_roots(len(nodes), pairs[:len(a)], pairs[len(a):])
+        remap = np.arange(h * w + 1, dtype=np.int32)
+        remap[-1] = -1
+        remap[nodes] = nodes[parent]
+        labels = remap[labels]
+
 
 class Maze:
-    def __init__(self, width, height, cell_size):
+    # Neighbour bits in `exits`
+    UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+
+    WALL_COLOR = (22, 160, 133)
+    INNER_COLOR = (247, 220, 111)
+    COLORKEY = (255, 0, 255)  # Transparent background of the cached wall layer
+    CHUNK = 16                # Cells per side of one lazily built wall chunk
+    MAX_CHUNKS = 64           # Chunk surfaces kept around (LRU)
+
+    def __init__(self, width, height, cell_size, rng=None, density=0.25):
         self.width = width
         self.height = height
-        self.cell_size = cell_size
-        self.grid = self.generate_maze()
+        self.rng = rng or random.Random()  # Owned by the Game for reproducible matches
+        self.density = density             # Share of interior cells that start as walls
+        self.version = 0      # Bumped by invalidate() so others can drop their caches
+        self._surface = None  # Pre-rendered wall layer, built lazily by draw()
+        self._chunks = OrderedDict()  # (cx, cy) -> wall chunk, built lazily by draw_view()
+        self._free = None     # Flat indices of walkable cells, built lazily
+        self._exits = None    # Per-cell neighbour bitmasks, built lazily
+        self._cell_size = cell_size
+        self._wall_color = self.WALL_COLOR
+        self._inner_color = self.INNER_COLOR
+        self.regenerate()
+
+    def regenerate(self):
+        """New layout of the same size from the next draw of ``rng``."""
+        self.seed = self.rng.getrandbits(64)  # Layout seed; also the cache key
+        self.grid = self.load_or_generate()
+
+    # --------------------------------------------------
+    # The grid lives in one contiguous byte buffer with a one-cell wall
+    # border, so `walkable` needs no bounds checks for x in [-1, width] and
+    # y in [-1, height]. `cells` is a NumPy view of the padded buffer and
+    # `grid` the unpadded view; grid[y][x] keeps working for old callers and
+    # writes through to the buffer.
+    # --------------------------------------------------
+    @property
+    def grid(self):
+        return self.cells[1:-1, 1:-1]
+
+    @grid.setter
+    def grid(self, grid):
+        grid = np.asarray(grid, dtype=np.uint8)
+        self.height, self.width = grid.shape
+        self.stride = self.width + 2
+        self._buf = bytearray(self.stride * (self.height + 2))
+        self.cells = np.frombuffer(self._buf, dtype=np.uint8).reshape(self.height + 2, self.stride)
+        self.cells[:] = 1
+        self.cells[1:-1, 1:-1] = grid
+        self.invalidate()
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    @cell_size.setter
+    def cell_size(self, cell_size):
+        self._cell_size = cell_size
+        self.invalidate()
+
+    @property
+    def wall_color(self):
+        return self._wall_color
+
+    @wall_color.setter
+    def wall_color(self, color):
+        self._wall_color = tuple(color)
+        self.invalidate()
+
+    @property
+    def inner_color(self):
+        return self._inner_color
+
+    @inner_color.setter
+    def inner_color(self, color):
+        self._inner_color = tuple(color)
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop the cached wall layers and free-cell index; all are rebuilt lazily.
+
+        Call this after mutating ``grid`` in place (``set_cell`` does it for you).
+        """
+        self.version += 1
+        self._surface = None
+        self._chunks.clear()
+        self._free = None
+        self._exits = None
+
+    def set_cell(self, x, y, value):
+        self._buf[(y + 1) * self.stride + x + 1] = value
+        self.invalidate()
 
     # --------------------------------------------------
-    # Generate maze grid with outer walls and random internal walls
+    # Generate maze grid with outer walls and random internal walls, then
+    # carve through until every walkable cell can reach every other
     # --------------------------------------------------
     def generate_maze(self):
-        grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
-
-        # Add outer boundary walls
-        for x in range(self.width):
-            grid[0][x] = 1
-            grid[self.height - 1][x] = 1
-        for y in range(self.height):
-            grid[y][0] = 1
-            grid[y][self.width - 1] = 1
-
-        # Add random internal walls (about 25% of total cells)
-        for _ in range(int(self.width * self.height * 0.25)):
-            x = random.randint(1, self.width - 2)
-            y = random.randint(1, self.height - 2)
-            grid[y][x] = 1
+        grid = np.ones((self.height, self.width), dtype=np.uint8)
+        rng = np.random.default_rng(self.seed)
+        grid[1:-1, 1:-1] = rng.random((self.height - 2, self.width - 2)) < self.density
+        return connect(grid)
+
+    # --------------------------------------------------
+    # Large mazes are cached on disk by (width, height, seed, density)
+    # --------------------------------------------------
+    def cache_path(self):
+        if not CACHE_DIR or self.width * self.height < CACHE_MIN_CELLS:
+            return None
+        name = f"maze-{self.width}x{self.height}-{self.seed:016x}-{self.density:g}.npy"
+        return os.path.join(CACHE_DIR, name)
 
+    def load_or_generate(self):
+        path = self.cache_path()
+        if path and os.path.exists(path):
+            grid = np.load(path)  # copied into the padded buffer anyway, so no mmap
+            if grid.shape == (self.height, self.width):
+                return grid
+        grid = self.generate_maze()
+        if path:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, grid)
+            os.replace(tmp, path)  # atomic, so concurrent workers never read half a file
         return grid
 
     # --------------------------------------------------
@@ -36,45 +256,149 @@ class Maze:
     def is_valid_position(self, x, y):
         if x < 0 or x >= self.width or y < 0 or y >= self.height:
             return False
-        return self.grid[y][x] == 0  # 0 = walkable, 1 = wall
+        return self._buf[(y + 1) * self.stride + x + 1] == 0  # 0 = walkable, 1 = wall
+
+    def walkable(self, x, y):
+        """Unchecked lookup; valid for -1 <= x <= width and -1 <= y <= height."""
+        return self._buf[(y + 1) * self.stride + x + 1] == 0
+
+    def walkable_many(self, xs, ys):
+        """Vectorized is_valid_position: boolean array for N cells at once."""
+        xs = np.clip(np.asarray(xs) + 1, 0, self.width + 1)
+        ys = np.clip(np.asarray(ys) + 1, 0, self.height + 1)
+        return self.cells[ys, xs] == 0
+
+    # --------------------------------------------------
+    # UP/DOWN/LEFT/RIGHT bits for each walkable cell whose neighbour in that
+    # direction is walkable too; walls get 0. Indexed [y, x], unpadded.
+    # --------------------------------------------------
+    @property
+    def exits(self):
+        if self._exits is None:
+            open_ = self.cells == 0
+            inner = open_[1:-1, 1:-1]
+            exits = np.zeros((self.height, self.width), dtype=np.uint8)
+            exits |= np.where(inner & open_[:-2, 1:-1], self.UP, 0).astype(np.uint8)
+            exits |= np.where(inner & open_[2:, 1:-1], self.DOWN, 0).astype(np.uint8)
+            exits |= np.where(inner & open_[1:-1, :-2], self.LEFT, 0).astype(np.uint8)
+            exits |= np.where(inner & open_[1:-1, 2:], self.RIGHT, 0).astype(np.uint8)
+            self._exits = exits
+        return self._exits
+
+    # --------------------------------------------------
+    # Index of walkable interior cells, stored as y * width + x
+    # --------------------------------------------------
+    def free_cells(self):
+        if self._free is None:
+            inner = np.zeros((self.height, self.width), dtype=bool)
+            inner[1:-1, 1:-1] = self.grid[1:-1, 1:-1] == 0
+            self._free = np.flatnonzero(inner).tolist()
+        return self._free
 
     # --------------------------------------------------
-    # Return a list of valid random positions on the maze
+    # Return `count` random walkable positions (pixel coordinates) that are
+    # at least `min_dist` cells apart, skipping the cells in `exclude`.
+    #
+    # Dart throwing against a bucket grid (Poisson-disk sampling): each
+    # candidate is checked against the 3x3 buckets around it only. Once
+    # random draws keep failing, the remaining free cells are swept in random
+    # order, so the result is exactly `count` positions unless the maze is
+    # genuinely too full — then NoValidPositionError is raised, or with
+    # allow_fewer=True as many positions as fit are returned.
     # --------------------------------------------------
-    def get_valid_positions(self, count):
+    def get_valid_positions(self, count, exclude=(), min_dist=3, allow_fewer=False):
+        free = self.free_cells()
+        w, cs, rng = self.width, self.cell_size, self.rng
+        min_d2 = max(min_dist * min_dist, 1)  # never the same cell twice
+        bs = max(min_dist, 1)                 # bucket size in cells
+        buckets = {}
         valid = []
-        tries, max_try = 0, 1000
-        while len(valid) < count and tries < max_try:
-            x = random.randint(1, self.width - 2)
-            y = random.randint(1, self.height - 2)
-            if self.is_valid_position(x, y):
-                pos = (x * self.cell_size, y * self.cell_size)
-                # Ensure each position is not too close to existing ones (at least 3 cells apart)
-                if all(((pos[0]-px)**2 + (pos[1]-py)**2) >= (3 * self.cell_size)**2 for px, py in valid):
-                    valid.append(pos)
-            tries += 1
+
+        def try_cell(i):
+            y, x = divmod(i, w)
+            if (x, y) in exclude:
+                return False
+            bx, by = x // bs, y // bs
+            for nbx in (bx - 1, bx, bx + 1):
+                for nby in (by - 1, by, by + 1):
+                    for qx, qy in buckets.get((nbx, nby), ()):
+                        if (qx - x) ** 2 + (qy - y) ** 2 < min_d2:
+                            return False
+            buckets.setdefault((bx, by), []).append((x, y))
+            valid.append((x * cs, y * cs))
+            return True
+
+        misses, max_misses = 0, 32 + count
+        while free and len(valid) < count and misses < max_misses:
+            misses = 0 if try_cell(free[rng.randrange(len(free))]) else misses + 1
+
+        if len(valid) < count:
+            order = free[:]
+            rng.shuffle(order)
+            for i in order:
+                if try_cell(i) and len(valid) == count:
+                    break
+
+        if len(valid) < count and not allow_fewer:
+            raise NoValidPositionError(
+                f"Maze {self.width}x{self.height} fits only {len(valid)} of {count} "
+                f"positions {min_dist} cells apart")
         return valid
 
+    # --------------------------------------------------
+    # Render the walls in the cell rect `area` (x, y, w, h) into an
+    # off-screen layer; by default the whole maze
+    # --------------------------------------------------
+    def render_walls(self, area=None):
+        cs = self.cell_size
+        x0, y0, w, h = area or (0, 0, self.width, self.height)
+        surf = pygame.Surface((w * cs, h * cs))
+        surf.fill(self.COLORKEY)
+        surf.set_colorkey(self.COLORKEY, pygame.RLEACCEL)
+
+        for y, x in np.argwhere(self.grid[y0:y0 + h, x0:x0 + w] == 1).tolist():
+            rect = pygame.Rect(x * cs, y * cs, cs, cs)
+            # Draw solid wall block
+            pygame.draw.rect(surf, self.wall_color, rect)
+            # Rounded corners
+            pygame.draw.rect(surf, self.wall_color, rect, border_radius=cs // 4)
+            # Inner highlight
+            pygame.draw.rect(surf, self.inner_color,
+                             rect.inflate(-2, -2), width=1, border_radius=cs // 6)
+        return surf
+
     # --------------------------------------------------
     # Draw the maze walls to the screen; support vertical offset
     # --------------------------------------------------
     def draw(self, screen, offset_y=0):
-        wall_color = (22, 160, 133 )
-        inner_color = (247, 220, 111)
-
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] == 1:
-                    rect = pygame.Rect(
-                        x * self.cell_size,
-                        y * self.cell_size + offset_y,  # Apply vertical offset
-                        self.cell_size,
-                        self.cell_size
-                    )
-                    # Draw solid wall block
-                    pygame.draw.rect(screen, wall_color, rect)
-                    # Rounded corners
-                    pygame.draw.rect(screen, wall_color, rect, border_radius=self.cell_size // 4)
-                    # Inner highlight
-                    pygame.draw.rect(screen, inner_color,
-                                     rect.inflate(-2, -2), width=1, border_radius=self.cell_size // 6)
+        if self._surface is None:
+            self._surface = self.render_walls()
+        screen.blit(self._surface, (0, offset_y))
+
+    # --------------------------------------------------
+    # Draw only the part of the maze inside `view` (a rect in maze pixels)
+    # with its top-left corner at `dest`. The maze is cut into CHUNK x CHUNK
+    # cell tiles that are rendered the first time they come into view, so
+    # the cost follows the view size rather than the maze size.
+    # --------------------------------------------------
+    def draw_view(self, screen, view, dest=(0, 0)):
+        span = self.CHUNK * self.cell_size
+        cols = -(-self.width // self.CHUNK)
+        rows = -(-self.height // self.CHUNK)
+        for cy in range(max(0, view.top // span), min(rows, (view.bottom - 1) // span + 1)):
+            for cx in range(max(0, view.left // span), min(cols, (view.right - 1) // span + 1)):
+                screen.blit(self.chunk(cx, cy),
+                            (dest[0] + cx * span - view.x, dest[1] + cy * span - view.y))
+
+    def chunk(self, cx, cy):
+        surf = self._chunks.get((cx, cy))
+        if surf is not None:
+            self._chunks.move_to_end((cx, cy))
+            return surf
+        x0, y0 = cx * self.CHUNK, cy * self.CHUNK
+        surf = self.render_walls((x0, y0, min(self.CHUNK, self.width - x0),
+                                  min(self.CHUNK, self.height - y0)))
+        self._chunks[(cx, cy)] = surf
+        if len(self._chunks) > self.MAX_CHUNKS:
+            self._chunks.popitem(last=False)
+        return surf
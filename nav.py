@@ -0,0 +1,325 @@
+# nav.py — Shared BFS distance fields and the built-in bots that use them
+
+import argparse
+import heapq
+import sys
+from array import array
+from collections import Counter, OrderedDict
+
+from player import ACTION_NONE, ACTION_UP, ACTION_DOWN, ACTION_LEFT, ACTION_RIGHT
+
+INF = 1 << 30
+REVERSE = (ACTION_NONE, ACTION_DOWN, ACTION_UP, ACTION_RIGHT, ACTION_LEFT)  # by ACTION_*
+
+
+class NavGrid:
+    """Distance fields over ``Maze`` cells, shared by every bot in a game.
+
+    Cells are addressed by their flat index in the maze's padded buffer,
+    ``(gy + 1) * stride + gx + 1``, so the wall border stops every search
+    without bounds checks.
+
+    * ``field(target)`` is a BFS from one cell (a player to chase or flee),
+      cut off after ``reach`` steps and kept in an LRU keyed by the target.
+    * The dot field holds, for every cell, the distance to the nearest dot.
+      It is built once and then patched as dots are spawned and eaten (the
+      dot backend reports both through ``watchers``).
+
+    Everything is dropped and rebuilt when ``maze.version`` changes.
+    """
+
+    def __init__(self, maze, dots, reach=12, max_fields=256):
+        self.maze = maze
+        self.reach = reach
+        self.max_fields = max_fields
+        self._fields = OrderedDict()  # target index -> {index: distance}
+        self.hits = self.misses = 0
+        self._version = None
+        self.dots = None
+        self.attach(dots)
+
+    # --------------------------------------------------
+    # Geometry
+    # --------------------------------------------------
+    def _sync(self):
+        if self._version == self.maze.version:
+            return
+        maze = self.maze
+        self._version = maze.version
+        self.stride = s = maze.stride
+        self.walls = maze.cells.tobytes()  # padded grid, 1 = wall
+        self.steps = ((-s, ACTION_UP), (s, ACTION_DOWN), (-1, ACTION_LEFT), (1, ACTION_RIGHT))
+        self._fields.clear()
+        self._rebuild_dot_field()
+
+    def index(self, gx, gy):
+        self._sync()
+        return (gy + 1) * self.stride + gx + 1
+
+    def neighbours(self, i):
+        """(index, action) for each walkable neighbour of cell ``i``."""
+        walls = self.walls
+        return [(i + d, a) for d, a in self.steps if not walls[i + d]]
+
+    # --------------------------------------------------
+    # Single-target fields (LRU)
+    # --------------------------------------------------
+    def field(self, target):
+        self._sync()
+        dist = self._fields.get(target)
+        if dist is not None:
+            self._fields.move_to_end(target)
+            self.hits += 1
+            return dist
+        self.misses += 1
+        dist = self._bfs(target, self.reach)
+        self._fields[target] = dist
+        if len(self._fields) > self.max_fields:
+            self._fields.popitem(last=False)
+        return dist
+
+    def _bfs(self, start, limit):
+        walls, offsets = self.walls, [d for d, _ in self.steps]
+        dist = {start: 0}
+        frontier, d = [start], 0
+        while frontier and d < limit:
+            d += 1
+            nxt = []
+            for i in frontier:
+                for o in offsets:
+                    j = i + o
+                    if not walls[j] and j not in dist:
+                        dist[j] = d
+                        nxt.append(j)
+            frontier = nxt
+        return dist
+
+    # --------------------------------------------------
+    # Nearest-dot field, patched incrementally
+    # --------------------------------------------------
+    def attach(self, dots):
+        """Follow ``dots`` (a DotField or DotArray) from now on."""
+        if self.dots is not None and self in self.dots.watchers:
+            self.dots.watchers.remove(self)
+        self.dots = dots
+        dots.watchers.append(self)
+        self._version = None  # rebuild on next use
+
+    def _rebuild_dot_field(self):
+        n = len(self.walls)
+        self.dot_dist = array("i", [INF]) * n
+        self.owner = array("i", [-1]) * n  # the dot cell each distance leads to
+        self.dot_cells = {}                # index -> dots in that cell
+        for d in self.dots:
+            gx, gy = self.dots.cell_of(d.x, d.y)
+            i = (gy + 1) * self.stride + gx + 1
+            self.dot_cells[i] = self.dot_cells.get(i, 0) + 1
+        frontier = []
+        for i in self.dot_cells:
+            self.dot_dist[i], self.owner[i] = 0, i
+            frontier.append(i)
+        self._relax(frontier)
+
+    def _relax(self, frontier):
+        """Push distances outward from ``frontier`` wherever they improve."""
+        walls, dist, owner = self.walls, self.dot_dist, self.owner
+        offsets = [d for d, _ in self.steps]
+        while frontier:
+            nxt = []
+            for i in frontier:
+                d, o = dist[i] + 1, owner[i]
+                for off in offsets:
+                    j = i + off
+                    if d < dist[j] and not walls[j]:
+                        dist[j], owner[j] = d, o
+                        nxt.append(j)
+            frontier = nxt
+
+    def dot_added(self, gx, gy, power=False):
+        if self._version != self.maze.version:
+            return  # the next _sync() rebuilds from dots.cells()
+        i = (gy + 1) * self.stride + gx + 1
+        self.dot_cells[i] = self.dot_cells.get(i, 0) + 1
+        if self.dot_dist[i]:
+            self.dot_dist[i], self.owner[i] = 0, i
+            self._relax([i])
+
+    def dot_removed(self, gx, gy):
+        if self._version != self.maze.version:
+            return
+        i = (gy + 1) * self.stride + gx + 1
+        left = self.dot_cells.get(i, 0) - 1
+        if left > 0:
+            self.dot_cells[i] = left
+            return
+        self.dot_cells.pop(i, None)
+
+        # Every cell that led to this dot forms a connected region around it.
+        # Clear the region, then refill it from the distances on its border.
+        walls, dist, owner = self.walls, self.dot_dist, self.owner
+        offsets = [d for d, _ in self.steps]
+        region, stack = {i}, [i]
+        while stack:
+            c = stack.pop()
+            for off in offsets:
+                j = c + off
+                if owner[j] == i and j not in region:
+                    region.add(j)
+                    stack.append(j)
+        for c in region:
+            dist[c], owner[c] = INF, -1
+
+        heap = []
+        for c in region:
+            for off in offsets:
+                j = c + off
+                if j not in region and dist[j] < INF and not walls[j]:
+                    heap.append((dist[j] + 1, c, owner[j]))
+        heapq.heapify(heap)
+        while heap:
+            d, c, o = heapq.heappop(heap)
+            if d >= dist[c]:
+                continue
+            dist[c], owner[c] = d, o
+            for off in offsets:
+                j = c + off
+                if j in region and d + 1 < dist[j]:
+                    heapq.heappush(heap, (d + 1, j, o))
+
+    def dot_distance(self, i):
+        self._sync()
+        return self.dot_dist[i]
+
+    def stats(self):
+        return {"fields": len(self._fields), "hits": self.hits, "misses": self.misses}
+
+
+class BotController:
+    """Computer player: flee nearby hunters, chase nearby prey, else eat dots.
+
+    ``Game`` asks ``act(game, player)`` for an ``ACTION_*`` every tick in
+    place of keyboard input. Decisions depend only on the game state, so
+    seeded matches with bots replay exactly. A new decision is made only
+    when the player is ready to move; in between it keeps its heading.
+
+    Like the ghosts' scatter mode, a bot hunts for ``hunt`` ticks and then
+    leaves its prey alone for ``forage`` ticks (staggered per player):
+    players move at one speed, so a chase around a block never ends on its
+    own and would tie up hunter and prey for the rest of the match.
+    """
+
+    def __init__(self, flee=4, hunt=420, forage=240):
+        self.flee = flee  # run when a hunter is this many steps away or closer
+        self.hunt, self.forage = hunt, forage
+
+    def act(self, game, p):
+        if not p.alive:
+            return ACTION_NONE
+        if p.move_cooldown > 0 and p.action != ACTION_NONE:
+            return p.action
+
+        nav, cell, top = game.navigation, game.cell, game.TOP_MARGIN
+        gx, gy = p.x // cell, (p.y - top) // cell
+        here = nav.index(gx, gy)
+        options = nav.neighbours(here)
+        if not options:
+            return ACTION_NONE
+        # Rotate the tie-break order so bots do not all prefer the same way
+        k = p.index % len(options)
+        options = options[k:] + options[:k]
+
+        reach = nav.reach
+        cycle = self.hunt + self.forage
+        hunting = (game.ticks + p.index * cycle // 3) % cycle < self.hunt
+        hunters, prey = [], []
+        for o in game.players:
+            if o is p or not o.alive:
+                continue
+            ox, oy = o.x // cell, (o.y - top) // cell
+            if abs(ox - gx) + abs(oy - gy) > reach:
+                continue
+            if not p.power_mode and (o.power_mode or p in o.prey_set):
+                hunters.append(nav.field(nav.index(ox, oy)))
+            elif p.power_mode or (o in p.prey_set and hunting):
+                prey.append(nav.field(nav.index(ox, oy)))
+
+        field = min(prey, key=lambda f: f.get(here, INF)) if prey else None
+        chase = field.get(here, INF) if field else INF
+
+        # ---- Flee: maximise the distance to the closest hunter, but only
+        # while it is closer than our own prey and a step gains ground.
+        # Like a ghost, never turn back (unless cornered): a hunter that
+        # mirrors every move would otherwise rock both between two cells ----
+        danger = min(f.get(here, INF) for f in hunters) if hunters else INF
+        if danger <= self.flee and danger < chase:
+            def safety(option):
+                return min(f.get(option[0], reach + 1) for f in hunters)
+            back = REVERSE[p.action]
+            best = max([o for o in options if o[1] != back] or options, key=safety)
+            if safety(best) > danger:
+                return best[1]
+
+        # ---- Chase: step down the field of the closest prey ----
+        if chase < INF:
+            return min(options, key=lambda opt: field.get(opt[0], INF))[1]
+
+        # ---- Eat: step down the nearest-dot field ----
+        if nav.dot_distance(here) < INF:
+            return min(options, key=lambda opt: nav.dot_distance(opt[0]))[1]
+        return ACTION_NONE
+
+
+# --------------------------------------------------
+# Self-check: bots must keep moving, not settle into a standoff
+# --------------------------------------------------
+def check_bots(seeds=range(10), ticks=3600, limit=0.25, **options):
+    """Play all-bot matches and measure, per bot, the share of its live
+    ticks spent on its two most visited cells. Each match is played again
+    through ``Game.step`` with random actions, which bots must ignore.
+
+    Returns the worst share seen; raises AssertionError when a bot spends
+    more than ``limit`` of the match rocking between two cells, or when
+    the actions passed to ``step`` change what the bots do.
+    """
+    import random
+    from game import Game
+
+    worst = 0.0
+    for seed in seeds:
+        game = Game(None, seed=seed, bots="all", max_ticks=ticks, **options)
+        noisy = Game(None, seed=seed, bots="all", max_ticks=ticks, **options)
+        rng = random.Random(seed)
+        visits = [Counter() for _ in game.players]
+        while not game.game_over:
+            game.update()
+            noisy.step([rng.randrange(5) for _ in noisy.players])
+            for seen, p in zip(visits, game.players):
+                if p.alive:
+                    seen[p.x, p.y] += 1
+        assert [p.get_state() for p in noisy.players] == [p.get_state() for p in game.players], \
+            f"seed {seed}: actions passed to step() changed the bots' play"
+        for seen, p in zip(visits, game.players):
+            share = sum(n for _, n in seen.most_common(2)) / max(1, sum(seen.values()))
+            assert share <= limit, f"seed {seed}: bot {p.id} spent {share:.0%} on two cells"
+            worst = max(worst, share)
+    return worst
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Built-in bots; --check runs the self-check.")
+    ap.add_argument("--check", action="store_true",
+                    help="play all-bot matches and verify that the bots keep moving")
+    ap.add_argument("--matches", type=int, default=10)
+    ap.add_argument("--ticks", type=int, default=3600)
+    ap.add_argument("--players", type=int, default=3)
+    args = ap.parse_args(argv)
+    if not args.check:
+        ap.print_help()
+        return 0
+    worst = check_bots(range(args.matches), args.ticks, players=args.players)
+    print(f"{args.matches} matches: at most {worst:.0%} of a match on two cells")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
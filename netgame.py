@@ -0,0 +1,598 @@
+# netgame.py — Authoritative asyncio match server and thin network clients
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import struct
+import sys
+import time
+from collections import deque
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from game import Game
+from dotfield import DotField
+from nav import BotController
+from player import ACTION_NONE, ACTION_UP, ACTION_DOWN, ACTION_LEFT, ACTION_RIGHT
+from tournament import RandomWalker
+
+# --------------------------------------------------
+# Wire format: every message is u32 length, u8 kind, payload.
+#
+# HELLO   client -> server  JSON {"match": name, "options": {...}}
+# WELCOME server -> client  JSON {"seat": i, "options": {...}, "tick_rate": hz}
+# INPUT   client -> server  u8 action (player.ACTION_*), held until changed
+# STATE   server -> client  one tick, see encode_state()
+# ERROR   server -> client  UTF-8 reason, then the server hangs up
+# --------------------------------------------------
+HELLO, WELCOME, INPUT, STATE, ERROR = range(1, 6)
+HEADER = struct.Struct("<IB")
+
+# STATE payload: header, player records, spawned dots, eaten dots
+STATE_HEADER = struct.Struct("<IBHII")  # tick, flags, #players, #spawned, #eaten
+FULL, GAME_OVER = 1, 2                   # flags; FULL replaces every dot on the client
+SPAWNED = struct.Struct("<hhB")          # gx, gy, power
+EATEN = struct.Struct("<hh")             # gx, gy
+
+# A player record is u8 index, u8 mask, then the fields named in the mask
+POS, SCORE, STATUS, TIMERS, FACING = 1, 2, 4, 8, 16
+PLAYER_FIELDS = [
+    (POS, struct.Struct("<hh")),       # grid cell; dead players sit off-grid
+    (SCORE, struct.Struct("<i")),
+    (STATUS, struct.Struct("<B")),     # bit 0 alive, bit 1 power mode
+    (TIMERS, struct.Struct("<HH")),    # power_timer, respawn_timer
+    (FACING, struct.Struct("<bbbb")),  # direction x/y, last direction x/y
+]
+RECORD = struct.Struct("<BB")
+
+MAX_BUFFER = 1 << 20  # drop clients that fall this many bytes behind
+MAX_CLIENT_MESSAGE = 1024  # HELLO and INPUT are tiny; refuse anything bigger
+
+# Match options a client may pick in HELLO; everything else is the server's.
+# Bounded so one client cannot stall the shared loop with a huge match.
+MAX_PLAYERS = 16
+MAX_GRID = 256  # cells per side
+
+
+def parse_hello(kind, payload):
+    """Match name and requested options from a HELLO; raises ValueError."""
+    if kind != HELLO:
+        raise ValueError("expected HELLO")
+    try:
+        hello = json.loads(payload)  # UnicodeDecodeError and JSONDecodeError are ValueErrors
+    except RecursionError:
+        raise ValueError("HELLO is nested too deeply") from None
+    if not isinstance(hello, dict):
+        raise ValueError("HELLO must be a JSON object")
+    name = hello.get("match", "lobby")
+    if not isinstance(name, str) or not 0 < len(name) <= 64:
+        raise ValueError("match name must be a string of 1 to 64 characters")
+    return name, hello.get("options", {})
+
+
+def client_options(options):
+    """Validate the options a HELLO asks for; raises ValueError."""
+    if not isinstance(options, dict):
+        raise ValueError("options must be an object")
+    unknown = sorted(set(options) - {"seed", "players", "grid"})
+    if unknown:
+        raise ValueError(f"unsupported options: {', '.join(unknown)}")
+
+    def whole(value, lo, hi, what):
+        if type(value) is not int or not lo <= value <= hi:
+            raise ValueError(f"{what} must be a whole number from {lo} to {hi}")
+        return value
+
+    out = {}
+    if "seed" in options:
+        out["seed"] = whole(options["seed"], 0, 2**64 - 1, "seed")
+    if "players" in options:
+        out["players"] = whole(options["players"], 1, MAX_PLAYERS, "players")
+    if "grid" in options:
+        grid = options["grid"]
+        if not isinstance(grid, list) or len(grid) != 2:
+            raise ValueError("grid must be [width, height]")
+        out["grid"] = [whole(n, 8, MAX_GRID, "grid sides") for n in grid]
+    return out
+
+
+def pack(kind, payload=b""):
+    return HEADER.pack(len(payload), kind) + payload
+
+
+async def read_message(reader, max_size=None):
+    """Next (kind, payload); ValueError if it is longer than ``max_size``."""
+    size, kind = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if max_size is not None and size > max_size:
+        raise ValueError(f"message of {size} bytes is too large")
+    return kind, await reader.readexactly(size)
+
+
+def player_fields(game, p):
+    """The wire values of ``p``, in PLAYER_FIELDS order."""
+    cell, top = game.cell, game.TOP_MARGIN
+    return (
+        (p.x // cell, (p.y - top) // cell),
+        (p.score,),
+        (p.alive | p.power_mode << 1,),
+        (p.power_timer, max(0, p.respawn_timer)),
+        (p.direction_x, p.direction_y, p.last_dir_x, p.last_dir_y),
+    )
+
+
+class DotChanges:
+    """Dot watcher that collects one tick's spawns and removals."""
+
+    def __init__(self):
+        self.spawned, self.eaten = [], []
+
+    def dot_added(self, gx, gy, power=False):
+        self.spawned.append((gx, gy, power))
+
+    def dot_removed(self, gx, gy):
+        self.eaten.append((gx, gy))
+
+    def pop(self):
+        out = self.spawned, self.eaten
+        self.spawned, self.eaten = [], []
+        return out
+
+
+# --------------------------------------------------
+# Server side
+# --------------------------------------------------
+class Match:
+    """One authoritative Game plus the clients seated in it."""
+
+    def __init__(self, name, options, fill_bots=True):
+        self.name = name
+        self.game = Game(None, **options)
+        # Pin the grid so clients rebuild the same maze whatever their window size
+        self.options = dict(self.game._options, grid=[self.game.maze.width, self.game.maze.height])
+        self.fill_bots = fill_bots
+        self.seats = [None] * len(self.game.players)  # client per player
+        self.actions = [ACTION_NONE] * len(self.game.players)
+        self.changes = DotChanges()
+        self.game.dots.watchers.append(self.changes)
+        self._sent = [None] * len(self.game.players)  # fields in the last STATE
+        self.bytes_sent = 0
+        for p in self.game.players:
+            p.controller = BotController() if fill_bots else None
+
+    def join(self, client):
+        if None not in self.seats:
+            return None
+        seat = self.seats.index(None)
+        self.seats[seat] = client
+        self.game.players[seat].controller = None
+        self.actions[seat] = ACTION_NONE
+        return seat
+
+    def leave(self, client):
+        seat = self.seats.index(client)
+        self.seats[seat] = None
+        self.actions[seat] = ACTION_NONE
+        if self.fill_bots:
+            self.game.players[seat].controller = BotController()
+
+    @property
+    def empty(self):
+        return all(c is None for c in self.seats)
+
+    # --------------------------------------------------
+    def tick(self):
+        game = self.game
+        game.step(self.actions)
+        delta = self.encode_state(full=False)
+        full = None
+        for client in self.seats:
+            if client is None:
+                continue
+            if client.needs_full:
+                full = full or self.encode_state(full=True)
+                client.send(STATE, full)
+                client.needs_full = False
+            else:
+                client.send(STATE, delta)
+
+    def encode_state(self, full):
+        """Players whose wire fields changed and this tick's dot changes.
+
+        A full state carries every player and every dot instead; it goes to
+        clients that just joined. Deltas are relative to the previous tick,
+        which every client already has because TCP keeps them in order.
+        """
+        game = self.game
+        records = []
+        for i, p in enumerate(game.players):
+            fields = player_fields(game, p)
+            old = None if full else self._sent[i]
+            mask, body = 0, []
+            for (bit, fmt), value, before in zip(PLAYER_FIELDS, fields, old or [None] * 5):
+                if value != before:
+                    mask |= bit
+                    body.append(fmt.pack(*value))
+            if not full:
+                self._sent[i] = fields
+            if mask:
+                records.append(RECORD.pack(i, mask) + b"".join(body))
+
+        if full:
+            spawned = [(*game.dots.cell_of(d.x, d.y), d.is_power_pellet) for d in game.dots]
+            eaten = []
+        else:
+            spawned, eaten = self.changes.pop()
+        flags = (FULL if full else 0) | (GAME_OVER if game.game_over else 0)
+        parts = [STATE_HEADER.pack(game.ticks, flags, len(records), len(spawned), len(eaten))]
+        parts += records
+        parts += [SPAWNED.pack(gx, gy, power) for gx, gy, power in spawned]
+        parts += [EATEN.pack(gx, gy) for gx, gy in eaten]
+        payload = b"".join(parts)
+        self.bytes_sent += len(payload)
+        return payload
+
+
+class ServerClient:
+    def __init__(self, writer):
+        self.writer = writer
+        self.needs_full = True
+        self.closed = False
+
+    def send(self, kind, payload=b""):
+        if self.closed:
+            return
+        if self.writer.transport.get_write_buffer_size() > MAX_BUFFER:
+            self.close()  # too slow to keep up; it can rejoin for a full state
+            return
+        self.writer.write(pack(kind, payload))
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+
+class Server:
+    """Runs every match at a fixed tick rate on one asyncio loop.
+
+    Clients connect over TCP, say which match they want (it is created on
+    first use) and get the next free seat; empty seats are played by bots.
+    ``lateness`` records how far behind schedule each of the last
+    ``lateness_window`` ticks started, in seconds.
+    """
+
+    def __init__(self, tick_rate=60, options=None, fill_bots=True, lateness_window=36000):
+        self.tick_rate = tick_rate
+        self.options = options or {}
+        self.fill_bots = fill_bots
+        self.matches = {}
+        self.ticks = 0
+        self.lateness = deque(maxlen=lateness_window)
+        self._server = None
+        self._handlers = set()
+
+    async def start(self, host="127.0.0.1", port=0):
+        self._server = await asyncio.start_server(self.handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def run(self, duration=None):
+        loop = asyncio.get_running_loop()
+        period = 1 / self.tick_rate
+        next_t = start = loop.time()
+        while duration is None or next_t - start < duration:
+            next_t += period
+            # Always yield, even when behind, or an overrunning tick starves
+            # every client reader and writer on this loop
+            await asyncio.sleep(max(0.0, next_t - loop.time()))
+            late = loop.time() - next_t
+            self.lateness.append(max(0.0, late))
+            if late > 5 * period:
+                next_t = loop.time()  # hopelessly behind: skip ahead, don't burst
+            self.ticks += 1
+            for name, match in list(self.matches.items()):
+                match.tick()
+                if match.empty:
+                    del self.matches[name]
+
+    async def stop(self):
+        """Stop listening, hang up on every client and wait for their handlers."""
+        self._server.close()
+        for match in self.matches.values():
+            for client in match.seats:
+                if client is not None:
+                    client.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+
+    # --------------------------------------------------
+    async def handle(self, reader, writer):
+        client = ServerClient(writer)
+        match = seat = None
+        self._handlers.add(asyncio.current_task())
+        try:
+            try:
+                name, requested = parse_hello(*await read_message(reader, MAX_CLIENT_MESSAGE))
+            except ValueError as e:
+                client.send(ERROR, f"bad HELLO: {e}".encode())
+                return
+            match = self.matches.get(name)
+            if match is None:
+                try:
+                    options = dict(self.options, **client_options(requested))
+                    match = self.matches[name] = Match(name, options, self.fill_bots)
+                except ValueError as e:
+                    client.send(ERROR, f"cannot create match {name!r}: {e}".encode())
+                    return
+            seat = match.join(client)
+            if seat is None:
+                client.send(ERROR, f"match {name!r} is full".encode())
+                match = None
+                return
+            client.send(WELCOME, json.dumps({
+                "seat": seat, "options": match.options, "tick_rate": self.tick_rate,
+            }).encode())
+
+            while not client.closed:
+                kind, payload = await read_message(reader, MAX_CLIENT_MESSAGE)
+                if kind == INPUT and payload and payload[0] <= ACTION_RIGHT:
+                    match.actions[seat] = payload[0]
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            if match is not None and seat is not None:
+                match.leave(client)
+            client.close()
+            self._handlers.discard(asyncio.current_task())
+
+
+# --------------------------------------------------
+# Client side: a Game that is never updated, only fed STATE messages
+# --------------------------------------------------
+class Client:
+    """Mirror of one match; ``game.render()`` draws it like a local game."""
+
+    def __init__(self, screen=None):
+        self.screen = screen
+        self.game = None
+        self.seat = None
+        self.tick = 0
+        self.game_over = False
+        self.bytes_received = 0
+        self.arrivals = []  # perf_counter() of each STATE
+        self._reader = self._writer = None
+
+    async def connect(self, host, port, match="lobby", options=None):
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._writer.write(pack(HELLO, json.dumps({"match": match, "options": options or {}}).encode()))
+        kind, payload = await read_message(self._reader)
+        if kind == ERROR:
+            raise ConnectionError(payload.decode())
+        welcome = json.loads(payload)
+        self.seat = welcome["seat"]
+        self.tick_rate = welcome["tick_rate"]
+        # Same seed and options, so the maze matches the server's; dots and
+        # players come from the first (full) STATE
+        options = dict(welcome["options"], dot_backend="field", bots=None)
+        self.game = Game(self.screen, **options)
+        return self.seat
+
+    def send_action(self, action):
+        self._writer.write(pack(INPUT, bytes([action])))
+
+    async def receive(self):
+        """Wait for and apply the next STATE; False once the server hangs up."""
+        try:
+            kind, payload = await read_message(self._reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return False
+        if kind == ERROR:
+            raise ConnectionError(payload.decode())
+        if kind == STATE:
+            self.arrivals.append(time.perf_counter())
+            self.bytes_received += len(payload)
+            self.apply(payload)
+        return True
+
+    def apply(self, payload):
+        game = self.game
+        cell, top = game.cell, game.TOP_MARGIN
+        tick, flags, n_players, n_spawned, n_eaten = STATE_HEADER.unpack_from(payload)
+        pos = STATE_HEADER.size
+        self.tick, self.game_over = tick, bool(flags & GAME_OVER)
+        game.ticks, game.game_over = tick, self.game_over
+
+        for _ in range(n_players):
+            i, mask = RECORD.unpack_from(payload, pos)
+            pos += RECORD.size
+            p = game.players[i]
+            for bit, fmt in PLAYER_FIELDS:
+                if not mask & bit:
+                    continue
+                value = fmt.unpack_from(payload, pos)
+                pos += fmt.size
+                if bit == POS:
+                    p.x, p.y = value[0] * cell, value[1] * cell + top
+                elif bit == SCORE:
+                    p.score = value[0]
+                elif bit == STATUS:
+                    p.alive, p.power_mode = bool(value[0] & 1), bool(value[0] & 2)
+                elif bit == TIMERS:
+                    p.power_timer, p.respawn_timer = value
+                else:
+                    p.direction_x, p.direction_y, p.last_dir_x, p.last_dir_y = value
+
+        if flags & FULL:
+            game.dots = DotField(cell, top)
+            game.dots.track_changes(game.dirty_rects)
+            game.request_full_redraw()
+        dots = game.dots
+        for gx, gy, power in SPAWNED.iter_unpack(payload[pos:pos + n_spawned * SPAWNED.size]):
+            dots.spawn(gx * cell, gy * cell + top, bool(power))
+        pos += n_spawned * SPAWNED.size
+        for gx, gy in EATEN.iter_unpack(payload[pos:pos + n_eaten * EATEN.size]):
+            for d in dots.at(gx, gy)[:1]:
+                dots.remove(d)
+
+    def close(self):
+        if self._writer:
+            self._writer.close()
+
+
+# --------------------------------------------------
+# Interactive client: arrows or WASD steer your seat
+# --------------------------------------------------
+KEY_ACTIONS = {
+    pygame.K_UP: ACTION_UP, pygame.K_w: ACTION_UP,
+    pygame.K_DOWN: ACTION_DOWN, pygame.K_s: ACTION_DOWN,
+    pygame.K_LEFT: ACTION_LEFT, pygame.K_a: ACTION_LEFT,
+    pygame.K_RIGHT: ACTION_RIGHT, pygame.K_d: ACTION_RIGHT,
+}
+
+
+async def play(host, port, match, options, size=(800, 600)):
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode(size)
+    client = Client(screen)
+    seat = await client.connect(host, port, match, options)
+    pygame.display.set_caption(f"Pac-Man online — {match}, player {client.game.players[seat].id}")
+
+    receiver = asyncio.ensure_future(receive_forever(client))
+    held = []  # movement keys currently down, most recent last
+    try:
+        while not receiver.done():
+            for ev in pygame.event.get():
+                if ev.type == pygame.QUIT:
+                    return
+                if ev.type == pygame.KEYDOWN and ev.key in KEY_ACTIONS:
+                    held.append(ev.key)
+                elif ev.type == pygame.KEYUP and ev.key in held:
+                    held.remove(ev.key)
+                elif ev.type == pygame.KEYDOWN and ev.key == pygame.K_TAB:
+                    client.game.handle_event(ev)
+                else:
+                    continue
+                client.send_action(KEY_ACTIONS[held[-1]] if held else ACTION_NONE)
+            dirty = client.game.render()
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+            await asyncio.sleep(1 / 60)
+    finally:
+        receiver.cancel()
+        client.close()
+        pygame.quit()
+
+
+async def receive_forever(client):
+    while await client.receive():
+        pass
+
+
+# --------------------------------------------------
+# Load test: one in-process server, scripted clients over 127.0.0.1
+# --------------------------------------------------
+async def scripted_client(port, match, seed, duration):
+    client = Client()
+    await client.connect("127.0.0.1", port, match)
+    walker = RandomWalker(random.Random(seed))
+    action = None
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end and await client.receive():
+        new = walker.act()
+        if new != action:
+            client.send_action(new)
+            action = new
+    client.close()
+    return client
+
+
+def jitter_stats(client, tick_rate):
+    gaps = [b - a for a, b in zip(client.arrivals, client.arrivals[1:])]
+    period = 1 / tick_rate
+    if not gaps:
+        return {}
+    dev = sorted(abs(g - period) * 1000 for g in gaps)
+    return {
+        "states": len(client.arrivals),
+        "mean_gap_ms": round(statistics.fmean(gaps) * 1000, 3),
+        "jitter_p50_ms": round(dev[len(dev) // 2], 3),
+        "jitter_p99_ms": round(dev[min(len(dev) - 1, int(len(dev) * 0.99))], 3),
+        "bytes_per_tick": round(client.bytes_received / len(client.arrivals), 1),
+    }
+
+
+async def load_test(matches, clients, seconds, tick_rate, options):
+    server = Server(tick_rate, options)
+    port = await server.start()
+    ticker = asyncio.ensure_future(server.run(seconds + 1))
+    tasks = [scripted_client(port, f"m{m}", m * 100 + c, seconds)
+             for m in range(matches) for c in range(clients)]
+    done = await asyncio.gather(*tasks)
+    await ticker
+    await server.stop()
+
+    per_client = [jitter_stats(c, tick_rate) for c in done]
+    late = sorted(server.lateness)
+    pick = lambda key, q: sorted(s[key] for s in per_client if s)[int(q * (len(per_client) - 1))]
+    return {
+        "matches": matches,
+        "clients": matches * clients,
+        "tick_rate": tick_rate,
+        "server_ticks": server.ticks,
+        "tick_late_p50_ms": round(late[len(late) // 2] * 1000, 3),
+        "tick_late_p99_ms": round(late[int(len(late) * 0.99)] * 1000, 3),
+        "client_jitter_p50_ms": pick("jitter_p50_ms", 0.5),
+        "client_jitter_p99_ms": pick("jitter_p99_ms", 0.99),
+        "bytes_per_tick_mean": round(statistics.fmean(s["bytes_per_tick"] for s in per_client if s), 1),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Networked Pac-Man: server, client and load test.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    serve = sub.add_parser("serve", help="run an authoritative server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=7777)
+    serve.add_argument("--tick-rate", type=int, default=60)
+    serve.add_argument("--no-bots", action="store_true", help="leave empty seats idle")
+
+    join = sub.add_parser("play", help="join a match in a window")
+    join.add_argument("--host", default="127.0.0.1")
+    join.add_argument("--port", type=int, default=7777)
+    join.add_argument("--match", default="lobby")
+    join.add_argument("--seed", type=int, help="seed for a match this client creates")
+
+    load = sub.add_parser("loadtest", help="in-process server plus scripted clients on 127.0.0.1")
+    load.add_argument("--matches", type=int, default=4)
+    load.add_argument("--clients", type=int, default=3, help="clients per match")
+    load.add_argument("--seconds", type=float, default=10)
+    load.add_argument("--tick-rate", type=int, default=60)
+    load.add_argument("--players", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "serve":
+        async def serve_forever():
+            server = Server(args.tick_rate, fill_bots=not args.no_bots)
+            port = await server.start(args.host, args.port)
+            print(f"serving on {args.host}:{port} at {args.tick_rate} Hz")
+            await server.run()
+        asyncio.run(serve_forever())
+    elif args.cmd == "play":
+        options = {} if args.seed is None else {"seed": args.seed}
+        asyncio.run(play(args.host, args.port, args.match, options))
+    else:
+        result = asyncio.run(load_test(args.matches, args.clients, args.seconds,
+                                       args.tick_rate, {"players": args.players}))
+        json.dump(result, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
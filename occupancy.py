@@ -0,0 +1,80 @@
+# occupancy.py — Live players indexed by maze cell
+
+class Occupancy:
+    """Which live players stand in which grid cell.
+
+    Kept up to date as players move, die and respawn, so the eat phase only
+    compares a player with the others in its own and the eight neighbouring
+    cells (``Player.collides_with`` cannot reach further) instead of with
+    every other player. While every live player sits exactly on a cell (the
+    normal case: players move a whole cell at a time) touching means sharing
+    a cell, and only that one bucket is checked.
+    """
+
+    NEIGHBOURHOOD = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+    def __init__(self, cell, top_margin):
+        self.cell = cell
+        self.top_margin = top_margin
+        self._cells = {}  # (gx, gy) -> [Player, ...]
+        self._where = {}  # Player -> (gx, gy)
+        self._loose = set()  # live players not aligned to the grid
+
+    def cell_of(self, x, y):
+        return x // self.cell, (y - self.top_margin) // self.cell
+
+    def aligned(self, p):
+        return not (p.x % self.cell or (p.y - self.top_margin) % self.cell)
+
+    # --------------------------------------------------
+    def add(self, p):
+        key = self.cell_of(p.x, p.y)
+        self._cells.setdefault(key, []).append(p)
+        self._where[p] = key
+        if not self.aligned(p):
+            self._loose.add(p)
+
+    def remove(self, p):
+        key = self._where.pop(p, None)
+        if key is None:
+            return
+        self._loose.discard(p)
+        bucket = self._cells[key]
+        bucket.remove(p)
+        if not bucket:
+            del self._cells[key]
+
+    def move(self, p):
+        """Re-file ``p`` after its position changed."""
+        if self._where.get(p) != self.cell_of(p.x, p.y) or self.aligned(p) == (p in self._loose):
+            self.remove(p)
+            self.add(p)
+
+    def rebuild(self, players):
+        self._cells.clear()
+        self._where.clear()
+        self._loose.clear()
+        for p in players:
+            if p.alive:
+                self.add(p)
+
+    # --------------------------------------------------
+    def near(self, p):
+        """Live players that could touch ``p``, in ``Game.players`` order."""
+        key = self._where.get(p) or self.cell_of(p.x, p.y)
+        if not self._loose:
+            found = self._cells.get(key, ())
+            return sorted(found, key=lambda o: o.index) if len(found) > 1 else found
+        gx, gy = key
+        found = []
+        for dx, dy in self.NEIGHBOURHOOD:
+            found += self._cells.get((gx + dx, gy + dy), ())
+        if len(found) > 1:
+            found.sort(key=lambda o: o.index)
+        return found
+
+    def cells(self):
+        return self._cells.keys()
+
+    def __len__(self):
+        return len(self._where)
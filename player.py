@@ -1,23 +1,79 @@
+from operator import attrgetter
+
 import pygame
-import math
+
+from sprites import MOUTH_PHASES, PlayerSprites, facing
+
+# Programmatic actions (one byte each) for headless play, replays and bots
+ACTION_NONE, ACTION_UP, ACTION_DOWN, ACTION_LEFT, ACTION_RIGHT = range(5)
+ACTION_DIRECTIONS = ((0, 0), (0, -1), (0, 1), (-1, 0), (1, 0))
+
+# The classic three players: (id, colour, (up, down, left, right) keys)
+CLASSIC_PLAYERS = [
+    ("A", (255, 255, 0), (pygame.K_w, pygame.K_s, pygame.K_a, pygame.K_d)),
+    ("B", (255, 0, 0), (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT)),
+    ("C", (0, 255, 255), (pygame.K_i, pygame.K_k, pygame.K_j, pygame.K_l)),
+]
+
+
+def player_specs(n):
+    """Specs for ``n`` players: the classic three, then generated ones.
+
+    Extra players get distinct hues (golden-angle steps) and no keys; they
+    are driven by actions (bots, headless runs) rather than the keyboard.
+    """
+    specs = [list(spec) for spec in CLASSIC_PLAYERS[:n]]
+    for i in range(len(specs), n):
+        color = pygame.Color(0)
+        color.hsva = ((i * 137.508) % 360, 85, 100, 100)
+        name = chr(ord("A") + i) if i < 26 else f"P{i + 1}"
+        specs.append([name, tuple(color)[:3], None])
+    return specs
+
 
 class Player:
+    # Everything that changes during a match (see get_state / set_state)
+    STATE_FIELDS = ("x", "y", "score", "power_mode", "power_timer", "alive",
+                    "respawn_timer", "direction_x", "direction_y",
+                    "last_dir_x", "last_dir_y", "move_cooldown",
+                    "kills", "deaths", "dots_eaten")
+
+    __slots__ = ("id", "color", "original_color", "speed", "index", "prey", "prey_set",
+                 "key_up", "key_down", "key_left", "key_right", "MOVE_COOLDOWN",
+                 "controller", "_sprites") + STATE_FIELDS
+
     def __init__(self, player_id, color, key_up, key_down, key_left, key_right):
         self.id = player_id
         self.color = color
         self.original_color = color  # For power mode flashing
-        self.x = self.y = 0
         self.speed = 2
+        self.index = 0    # Position in Game.players
+        self.prey = None  # First prey, shown on the scoreboard
+        self.prey_set = set()  # Everyone this player may eat; assigned by the Game
+
+        # Movement keys
+        self.key_up, self.key_down = key_up, key_down
+        self.key_left, self.key_right = key_left, key_right
+
+        # Frames to wait between moves
+        self.MOVE_COOLDOWN = 6
+
+        # Computer control (e.g. nav.BotController); replaces keyboard input
+        self.controller = None
+
+        # Pre-rendered frames, built on first draw (see sprites.PlayerSprites)
+        self._sprites = None
+        self.reset()
+
+    def reset(self):
+        """Start-of-match values for everything in STATE_FIELDS."""
+        self.x = self.y = 0
         self.score = 0
-        self.prey = None  # Assigned later by the Game
         self.power_mode = False
         self.power_timer = 0
         self.alive = True
         self.respawn_timer = 0
-
-        # Movement keys
-        self.key_up, self.key_down = key_up, key_down
-        self.key_left, self.key_right = key_left, key_right
+        self.kills = self.deaths = self.dots_eaten = 0  # Match statistics
 
         # Current direction (-1/0/1 for x and y)
         self.direction_x = self.direction_y = 0
@@ -28,7 +84,6 @@ class Player:
 
         # Movement cooldown (how many frames to wait before moving again)
         self.move_cooldown = 0
-        self.MOVE_COOLDOWN = 6
 
     # -------------------------------
     # Keyboard event handlers
@@ -52,10 +107,33 @@ class Player:
         elif key in (self.key_left, self.key_right):
             self.direction_x = 0
 
+    # -------------------------------
+    # Programmatic input: hold one of the ACTION_* directions
+    # -------------------------------
+    def apply_action(self, action):
+        self.direction_x, self.direction_y = ACTION_DIRECTIONS[action]
+        if action != ACTION_NONE:
+            self.last_dir_x, self.last_dir_y = self.direction_x, self.direction_y
+
+    @property
+    def action(self):
+        """The ACTION_* matching the current direction."""
+        return ACTION_DIRECTIONS.index((self.direction_x, self.direction_y))
+
+    # -------------------------------
+    # Match state for snapshots and replays
+    # -------------------------------
+    def get_state(self):
+        return _get_state(self)
+
+    def set_state(self, state):
+        for f, v in zip(self.STATE_FIELDS, state):
+            setattr(self, f, v)
+
     # -------------------------------
     # Compute next position
     # -------------------------------
-    def calculate_new_position(self, cell, maze, top_margin):
+    def calculate_new_position(self, cell, maze, top_margin, bounds):
         if not self.alive or (self.direction_x == 0 and self.direction_y == 0):
             return self.x, self.y
 
@@ -69,9 +147,9 @@ class Player:
         step_y = self.direction_y * cell
         nx, ny = self.x + step_x, self.y + step_y
 
-        # Clamp to screen boundaries
-        max_x = pygame.display.get_surface().get_width() - cell
-        max_y = pygame.display.get_surface().get_height() - cell
+        # Clamp to world boundaries (logical width, height in pixels)
+        max_x = bounds[0] - cell
+        max_y = bounds[1] - cell
         nx = max(0, min(nx, max_x))
         ny = max(top_margin, min(ny, max_y))
 
@@ -79,7 +157,7 @@ class Player:
         for cx, cy in [(nx, ny), (nx + cell - 1, ny),
                        (nx, ny + cell - 1), (nx + cell - 1, ny + cell - 1)]:
             gx, gy = int(cx // cell), int((cy - top_margin) // cell)
-            if not maze.is_valid_position(gx, gy):
+            if not maze.walkable(gx, gy):
                 return self.x, self.y  # Movement blocked by wall
 
         # Movement successful, reset cooldown
@@ -102,42 +180,23 @@ class Player:
     # -------------------------------
     # Drawing the player on screen
     # -------------------------------
-    def draw(self, screen, cell):
-        radius = cell // 2
-        center = (self.x + radius, self.y + radius)
+    def draw(self, screen, cell, offset=(0, 0)):
+        # Frames are baked once per cell size; drawing is a single blit
+        if self._sprites is None or not self._sprites.matches(self.id, self.color, cell):
+            self._sprites = PlayerSprites(self.id, self.color, cell)
 
         # Flash white if in power mode
-        draw_col = (255, 255, 255) if self.power_mode and (self.power_timer // 5) % 2 == 0 else self.color
+        flash = self.power_mode and (self.power_timer // 5) % 2 == 0
 
         # Use current direction or last known direction if not moving
         dx = self.direction_x if self.direction_x else self.last_dir_x
         dy = self.direction_y if self.direction_y else self.last_dir_y
 
-        # Determine mouth direction
-        if dx == 1:
-            start_angle, end_angle = 30, 330  # Right
-        elif dx == -1:
-            start_angle, end_angle = 210, 150  # Left
-        elif dy == -1:
-            start_angle, end_angle = 120, 60  # Up
-        elif dy == 1:
-            start_angle, end_angle = 300, 240  # Down
-        else:
-            start_angle, end_angle = 30, 330  # Default right
-
         # Animate mouth opening/closing
-        mouth_speed, mouth_var = 3, 20
-        off = mouth_var * ((pygame.time.get_ticks() // 100) % mouth_speed) / mouth_speed
-        start_angle += off
-        end_angle -= off
+        phase = (pygame.time.get_ticks() // 100) % MOUTH_PHASES
 
-        # Draw Pac-Man body with arc mouth
-        pygame.draw.arc(screen, draw_col, (self.x, self.y, cell, cell),
-                        math.radians(start_angle), math.radians(end_angle), radius)
+        pos = (self.x + offset[0], self.y + offset[1])
+        self._sprites.blit(screen, pos, facing(dx, dy), phase, flash)
 
-        # Draw inner circle for eye / ID background
-        pygame.draw.circle(screen, (50, 50, 50), center, radius // 3)
 
-        # Render and draw player ID at center
-        txt = pygame.font.SysFont('Arial', 12).render(self.id, True, (255, 255, 255))
-        screen.blit(txt, txt.get_rect(center=center))
+_get_state = attrgetter(*Player.STATE_FIELDS)
@@ -0,0 +1,155 @@
+# profiler.py — Per-phase frame timing with an on-screen overlay
+
+import cProfile
+import json
+import time
+from array import array
+
+import pygame
+
+from fonts import get_font
+
+
+class FrameProfiler:
+    """Records how long each named phase takes, per frame, in ring buffers.
+
+    Callers bracket their phases with ``start()`` and ``lap(name)`` and close
+    the frame with ``end_frame()``. A phase that runs several times in one
+    frame (e.g. several updates per render) accumulates. When ``enabled`` is
+    False, callers are expected to skip the calls entirely, so the disabled
+    cost is a single attribute check per phase.
+    """
+
+    def __init__(self, size=300, enabled=False):
+        self.size = size
+        self.enabled = enabled
+        self.frames = 0                       # frames recorded so far
+        self.frame_ms = array("d", bytes(8 * size))
+        self.phases = {}                      # name -> array("d") of ms
+        self._t = 0.0
+        self._capture = None                  # [cProfile.Profile, frames left, path, was enabled]
+
+    # --------------------------------------------------
+    def start(self):
+        self._t = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        buf = self.phases.get(name)
+        if buf is None:
+            buf = self.phases[name] = array("d", bytes(8 * self.size))
+        buf[self.frames % self.size] += (now - self._t) * 1000
+        self._t = now
+
+    def end_frame(self):
+        i = self.frames % self.size
+        self.frame_ms[i] = sum(buf[i] for buf in self.phases.values())
+        self.frames += 1
+        j = self.frames % self.size
+        for buf in self.phases.values():
+            buf[j] = 0.0
+
+        if self._capture:
+            self._capture[1] -= 1
+            if self._capture[1] <= 0:
+                prof, _, path, was_enabled = self._capture
+                prof.disable()
+                prof.dump_stats(path)
+                self.enabled = was_enabled
+                self._capture = None
+
+    # --------------------------------------------------
+    # Rolling statistics over the frames currently in the ring
+    # --------------------------------------------------
+    def _window(self, buf):
+        n = min(self.frames, self.size)
+        if self.frames <= self.size:
+            return list(buf[:n])
+        i = self.frames % self.size
+        return list(buf[i:]) + list(buf[:i])
+
+    def recent_frames(self):
+        """Frame times in ms, oldest first."""
+        return self._window(self.frame_ms)
+
+    @staticmethod
+    def _stats(samples):
+        if not samples:
+            return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        s = sorted(samples)
+        return {
+            "mean": round(sum(s) / len(s), 4),
+            "p50": round(s[len(s) // 2], 4),
+            "p95": round(s[min(len(s) - 1, int(len(s) * 0.95))], 4),
+            "max": round(s[-1], 4),
+        }
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "window": min(self.frames, self.size),
+            "frame": self._stats(self.recent_frames()),
+            "phases": {name: self._stats(self._window(buf)) for name, buf in self.phases.items()},
+        }
+
+    def top_phases(self, n=5):
+        means = [(sum(self._window(buf)) / max(1, min(self.frames, self.size)), name)
+                 for name, buf in self.phases.items()]
+        return [(name, ms) for ms, name in sorted(means, reverse=True)[:n]]
+
+    # --------------------------------------------------
+    # Export to disk
+    # --------------------------------------------------
+    def export(self, path=None):
+        path = path or time.strftime("profile-%Y%m%d-%H%M%S.json")
+        data = self.stats()
+        data["recent_frames"] = [round(ms, 4) for ms in self.recent_frames()]
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def capture(self, frames=300, path=None):
+        """Run cProfile for the next ``frames`` frames and dump pstats to ``path``."""
+        if self._capture:
+            return self._capture[2]
+        path = path or time.strftime("profile-%Y%m%d-%H%M%S.prof")
+        prof = cProfile.Profile()
+        self._capture = [prof, frames, path, self.enabled]
+        self.enabled = True  # end_frame() has to run to count the frames down
+        prof.enable()
+        return path
+
+
+# --------------------------------------------------
+# Overlay: frame-time graph plus the most expensive phases
+# --------------------------------------------------
+def draw_overlay(screen, profiler, width=240, height=150):
+    x0 = screen.get_width() - width - 8
+    y0 = screen.get_height() - height - 8
+    panel = pygame.Surface((width, height), pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 180))
+    screen.blit(panel, (x0, y0))
+
+    font = get_font("Arial", 12)
+    graph_h = 60
+    budget_ms = 1000 / 60
+    scale = graph_h / (2 * budget_ms)  # full height = two 60 FPS frames
+
+    frames = profiler.recent_frames()[-(width - 16):]
+    base_y = y0 + 8 + graph_h
+    for i, ms in enumerate(frames):
+        h = min(graph_h, int(ms * scale))
+        color = (46, 204, 113) if ms <= budget_ms else (231, 76, 60)
+        pygame.draw.line(screen, color, (x0 + 8 + i, base_y), (x0 + 8 + i, base_y - h))
+    budget_y = base_y - int(budget_ms * scale)
+    pygame.draw.line(screen, (247, 220, 111), (x0 + 8, budget_y), (x0 + width - 8, budget_y))
+
+    stats = profiler.stats()["frame"]
+    lines = [f"frame p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  max {stats['max']:.2f} ms"]
+    lines += [f"{name:<12} {ms:6.3f} ms" for name, ms in profiler.top_phases(4)]
+    y = base_y + 6
+    for line in lines:
+        # values change every frame; render directly rather than filling the text cache
+        surf = font.render(line, True, (255, 255, 255))
+        screen.blit(surf, (x0 + 8, y))
+        y += surf.get_height()
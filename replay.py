@@ -0,0 +1,255 @@
+# replay.py — Compact input recording and fast, seekable replays
+
+import argparse
+import bisect
+import json
+import os
+import struct
+import sys
+import zlib
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from game import Game
+from snapshot import Snapshot
+
+MAGIC = b"PMRP"
+VERSION = 4  # 4: keyframes in a fixed layout, not pickled; 3: Snapshot records; 2: connected mazes
+
+
+def write_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def read_varint(buf, pos):
+    n = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+class InputLog:
+    """Per-tick player actions plus the seed and options that started the match.
+
+    Each tick is one byte per player (a ``player.ACTION_*`` code) and
+    consecutive identical ticks are stored as a single run. Optional state
+    keyframes let a replay seek without re-simulating from tick 0.
+
+    File layout: ``MAGIC, u8 version, u32 header length, header JSON,
+    u32 runs length, runs, u32 keyframe length, zlib(keyframes)`` where each
+    run is ``varint count`` followed by the frame bytes, and each keyframe
+    is ``u32 tick`` followed by a ``Snapshot.to_bytes()`` record.
+    """
+
+    def __init__(self, options, num_players):
+        self.options = dict(options)
+        self.num_players = num_players
+        self.runs = []      # [[count, frame bytes], ...]
+        self.starts = []    # first tick of each run, for bisect
+        self.ticks = 0
+        self.keyframes = {}  # tick -> Game.snapshot()
+
+    def append(self, frame):
+        if self.runs and self.runs[-1][1] == frame:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, frame])
+            self.starts.append(self.ticks)
+        self.ticks += 1
+
+    def frame(self, tick):
+        return self.runs[bisect.bisect_right(self.starts, tick) - 1][1]
+
+    def __len__(self):
+        return self.ticks
+
+    # --------------------------------------------------
+    def new_game(self, screen=None):
+        return Game(screen, **self.options)
+
+    def to_bytes(self):
+        header = json.dumps({"options": self.options, "players": self.num_players,
+                             "ticks": self.ticks}).encode()
+        runs = bytearray()
+        for count, frame in self.runs:
+            write_varint(runs, count)
+            runs += frame
+        keyframes = b"".join(struct.pack("<I", tick) + snap.to_bytes()
+                             for tick, snap in sorted(self.keyframes.items()))
+        keyframes = zlib.compress(keyframes) if keyframes else b""
+        return b"".join([
+            MAGIC, struct.pack("<BI", VERSION, len(header)), header,
+            struct.pack("<I", len(runs)), runs,
+            struct.pack("<I", len(keyframes)), keyframes,
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:4] != MAGIC:
+            raise ValueError("not a replay file")
+        version, size = struct.unpack_from("<BI", data, 4)
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        pos = 9
+        header = json.loads(data[pos:pos + size])
+        pos += size
+
+        log = cls(header["options"], header["players"])
+        (size,) = struct.unpack_from("<I", data, pos)
+        pos += 4
+        end, n = pos + size, header["players"]
+        while pos < end:
+            count, pos = read_varint(data, pos)
+            frame = bytes(data[pos:pos + n])
+            pos += n
+            log.runs.append([count, frame])
+            log.starts.append(log.ticks)
+            log.ticks += count
+
+        (size,) = struct.unpack_from("<I", data, pos)
+        if size:
+            data, pos = zlib.decompress(data[pos + 4:pos + 4 + size]), 0
+            while pos < len(data):
+                (tick,) = struct.unpack_from("<I", data, pos)
+                log.keyframes[tick], pos = Snapshot.from_bytes(data, pos + 4)
+        return log
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class InputRecorder:
+    """Attach to a Game; ``Game.update`` calls ``record`` before each tick."""
+
+    def __init__(self, game, keyframe_interval=3600):
+        self.keyframe_interval = keyframe_interval  # 0 disables keyframes
+        self.start(game)
+
+    def start(self, game):
+        game.recorder = self
+        self.log = InputLog(game._options, len(game.players))
+
+    def record(self, game):
+        if self.keyframe_interval and game.ticks % self.keyframe_interval == 0:
+            self.log.keyframes[game.ticks] = game.snapshot()
+        self.log.append(bytes(p.action for p in game.players))
+
+    def save(self, path):
+        self.log.save(path)
+
+
+class Replay:
+    """Re-simulates a recorded match; seeks by restoring the nearest keyframe."""
+
+    def __init__(self, log, screen=None, keyframe_interval=600):
+        self.log = log
+        self.game = log.new_game(screen)
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = dict(log.keyframes)
+        self.keyframes.setdefault(0, self.game.snapshot())
+        self._ticks = sorted(self.keyframes)
+
+    @property
+    def tick(self):
+        return self.game.ticks
+
+    def at_end(self):
+        return self.game.ticks >= len(self.log) or self.game.game_over
+
+    def step(self):
+        game = self.game
+        game.step(self.log.frame(game.ticks))
+        if game.ticks % self.keyframe_interval == 0 and game.ticks not in self.keyframes:
+            self.keyframes[game.ticks] = game.snapshot()
+            bisect.insort(self._ticks, game.ticks)
+
+    def seek(self, tick):
+        tick = max(0, min(tick, len(self.log)))
+        # Jump to the closest keyframe at or before `tick` unless we are already closer
+        best = self._ticks[bisect.bisect_right(self._ticks, tick) - 1]
+        if not best <= self.game.ticks <= tick:
+            self.game.restore(self.keyframes[best])
+        while self.game.ticks < tick and not self.game.game_over:
+            self.step()
+
+    def run(self):
+        """Play to the end at maximum speed."""
+        self.seek(len(self.log))
+        return self.game
+
+    # --------------------------------------------------
+    # Rendered playback: SPACE pause, LEFT/RIGHT seek 10s, UP/DOWN speed
+    # --------------------------------------------------
+    def play(self, speed=1.0, fps=60):
+        clock = pygame.time.Clock()
+        paused, budget = False, 0.0
+        while True:
+            for ev in pygame.event.get():
+                if ev.type == pygame.QUIT or (ev.type == pygame.KEYDOWN and ev.key == pygame.K_ESCAPE):
+                    return
+                if ev.type == pygame.KEYDOWN:
+                    if ev.key == pygame.K_SPACE:
+                        paused = not paused
+                    elif ev.key == pygame.K_LEFT:
+                        self.seek(self.tick - 10 * fps)
+                    elif ev.key == pygame.K_RIGHT:
+                        self.seek(self.tick + 10 * fps)
+                    elif ev.key == pygame.K_UP:
+                        speed *= 2
+                    elif ev.key == pygame.K_DOWN:
+                        speed /= 2
+
+            if not paused:
+                budget += speed
+                while budget >= 1 and not self.at_end():
+                    self.step()
+                    budget -= 1
+
+            self.game.render()
+            pygame.display.flip()
+            clock.tick(fps)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Replay a recorded match.")
+    ap.add_argument("path")
+    ap.add_argument("--render", action="store_true", help="show the match instead of simulating headless")
+    ap.add_argument("--speed", type=float, default=1.0, help="ticks per rendered frame")
+    ap.add_argument("--seek", type=int, default=0, help="start at this tick")
+    args = ap.parse_args(argv)
+
+    log = InputLog.load(args.path)
+    if not args.render:
+        game = Replay(log).run()
+        json.dump({"ticks": game.ticks, "scores": {p.id: p.score for p in game.players}}, sys.stdout)
+        print()
+        return
+
+    pygame.display.init()
+    pygame.font.init()
+    w, h = log.options["size"]
+    screen = pygame.display.set_mode((w, h))
+    pygame.display.set_caption("Replay")
+    replay = Replay(log, screen)
+    replay.seek(args.seek)
+    replay.play(args.speed)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import pygame
+
+from fonts import get_font, render_text
+
+
+class Scoreboard:
+    """Scoreboard strip drawn at the top of the screen.
+
+    The static chrome (background, key boxes, predator -> prey icons) is
+    rendered once; player cards are re-rendered only when what they show
+    changes, i.e. score, alive state or the whole-second power/respawn timer.
+
+    With more players than KEY_LAYOUTS the strip switches to a compact grid
+    of small cards (avatar and score) with no icon row.
+    """
+
+    KEY_LAYOUTS = [
+        ["W", "A", "S", "D"],
+        ["↑", "←", "↓", "→"],
+        ["I", "J", "K", "L"],
+    ]
+
+    PAD = 6
+    Y_BASELINE = 8     # vertical start for icons & keys
+    BOX_W, BOX_H = 28, 28
+    BOX_GAP = 6
+    ICON_H = 16        # height of the predator -> prey arrow
+    CARD_H = 26
+    CARD_MARGIN = 4    # vertical gap between row 1 and the cards
+    MINI_ROWS = 3      # rows of small cards in compact mode
+
+    def __init__(self, players, width, height, bg_color):
+        self.players = players
+        self.width, self.height = width, height
+        self.bg_color = bg_color
+        self.compact = len(players) > len(self.KEY_LAYOUTS)
+        if self.compact:
+            self.cols = -(-len(players) // self.MINI_ROWS)
+            rows = -(-len(players) // self.cols)
+            self.row_h = (height - 2 * self.PAD) // rows
+            self.col_w = (width - 2 * self.PAD) // self.cols
+        else:
+            self.col_w = width // len(players)
+
+        self.font_small = get_font("Arial", 14)
+        self.font_score = get_font("Arial", 18, bold=True)
+
+        self._surface = None            # chrome + current cards
+        self._cards = [None] * len(players)  # last rendered state per card
+
+    # --------------------------------------------------
+    def invalidate(self):
+        """Force the chrome and every card to be rebuilt on the next update()."""
+        self._surface = None
+
+    def card_rect(self, i):
+        if self.compact:
+            row, col = divmod(i, self.cols)
+            return pygame.Rect(self.PAD + col * self.col_w + 1, self.PAD + row * self.row_h + 1,
+                               self.col_w - 2, self.row_h - 2)
+        base_y = self.Y_BASELINE + max(self.ICON_H, self.BOX_H) + self.CARD_MARGIN
+        x0 = i * self.col_w + self.PAD
+        return pygame.Rect(x0, base_y, self.col_w - 2 * self.PAD, self.CARD_H)
+
+    @staticmethod
+    def card_state(p):
+        if p.power_mode:
+            timer = ("power", p.power_timer // 60 + 1)
+        elif not p.alive:
+            timer = ("respawn", p.respawn_timer // 60 + 1)
+        else:
+            timer = None
+        return p.score, p.alive, timer
+
+    # --------------------------------------------------
+    # Bring the cached surface up to date; return the rects that changed
+    # --------------------------------------------------
+    def update(self):
+        rebuilt = self._surface is None
+        if rebuilt:
+            self._chrome = self.render_chrome()
+            self._surface = self._chrome.copy()
+            self._cards = [None] * len(self.players)
+
+        dirty = []
+
+        for i, p in enumerate(self.players):
+            state = self.card_state(p)
+            if state == self._cards[i]:
+                continue
+            self._cards[i] = state
+            rect = self.card_rect(i)
+            # Restore the chrome under the card (it has rounded corners)
+            self._surface.blit(self._chrome, rect, rect)
+            self.render_card(self._surface, rect, p, state)
+            dirty.append(rect)
+        return [self._surface.get_rect()] if rebuilt else dirty
+
+    def draw(self, screen):
+        dirty = self.update()
+        screen.blit(self._surface, (0, 0))
+        return dirty
+
+    def draw_dirty(self, screen):
+        """Copy only the changed parts to ``screen``; return those rects."""
+        dirty = self.update()
+        for rect in dirty:
+            screen.blit(self._surface, rect, rect)
+        return dirty
+
+    # --------------------------------------------------
+    # Static chrome: background gradient, border, icons and key boxes
+    # --------------------------------------------------
+    def render_chrome(self):
+        surf = pygame.Surface((self.width, self.height))
+        surf.fill(self.bg_color)
+
+        grad = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        base_color = (22, 160, 133)
+        for y in range(self.height):
+            grad.fill((*base_color, 230), pygame.Rect(0, y, self.width, 1))
+        surf.blit(grad, (0, 0))
+        pygame.draw.rect(
+            surf,
+            (247, 220, 111),
+            pygame.Rect(0, 0, self.width, self.height),
+            width=2,
+            border_radius=8
+        )
+        if self.compact:
+            return surf  # the small cards carry each player's colour
+
+        arrow_surf = make_arrow_surf(height=self.ICON_H)
+        icon_height = arrow_surf.get_height()
+        spacer = pygame.Surface((6, 1), pygame.SRCALPHA)
+
+        # center-line for icons and boxes
+        icon_center_y = self.Y_BASELINE + icon_height / 2
+        box_y = int(icon_center_y - self.BOX_H / 2)
+
+        for i, p in enumerate(self.players):
+            x0 = i * self.col_w + self.PAD
+
+            # draw predator -> prey
+            pieces = [
+                make_circle_surf(p.color),
+                spacer,
+                arrow_surf,
+                spacer,
+                make_circle_surf(p.prey.color if p.prey else (90, 90, 90))
+            ]
+            cur_x = x0
+            for piece in pieces:
+                surf.blit(piece, (cur_x, self.Y_BASELINE))
+                cur_x += piece.get_width()
+
+            cur_x += 6  # small gap before controls
+
+            # draw control keys, horizontally aligned with icons
+            keys = self.KEY_LAYOUTS[i] if p.key_up is not None else []
+            for j, key in enumerate(keys):
+                bx = cur_x + j * (self.BOX_W + self.BOX_GAP)
+                box_rect = pygame.Rect(bx, box_y, self.BOX_W, self.BOX_H)
+
+                pygame.draw.rect(surf, (50, 50, 50), box_rect, border_radius=6)
+                pygame.draw.rect(surf, p.color, box_rect, width=2, border_radius=6)
+
+                key_surf = render_text(self.font_small, key, (255, 255, 255))
+                kx = bx + (self.BOX_W - key_surf.get_width()) // 2
+                ky = box_y + (self.BOX_H - key_surf.get_height()) // 2
+                surf.blit(key_surf, (kx, ky))
+        return surf
+
+    # --------------------------------------------------
+    # One player card: avatar, score and optional timer
+    # --------------------------------------------------
+    def render_card(self, surf, rect, p, state):
+        if self.compact:
+            return self.render_mini_card(surf, rect, p, state)
+        score, alive, timer = state
+        mid_y = rect.y + rect.h // 2
+
+        pygame.draw.rect(surf, (30, 30, 30, 220), rect, border_radius=10)
+        pygame.draw.rect(surf, p.color, rect, width=2, border_radius=10)
+
+        # avatar
+        pygame.draw.circle(
+            surf,
+            p.color if alive else (90, 90, 90),
+            (rect.x + 15, mid_y),
+            10,
+            0 if alive else 2
+        )
+
+        # score
+        score_surf = render_text(self.font_score, str(score), (255, 255, 255))
+        surf.blit(score_surf, (rect.x + 35, mid_y - score_surf.get_height() // 2))
+
+        # extra timer
+        if timer:
+            kind, seconds = timer
+            color_extra = (255, 215, 0) if kind == "power" else (200, 200, 200)
+            extra_surf = render_text(self.font_small, f"{seconds}s", color_extra)
+            surf.blit(
+                extra_surf,
+                (rect.right - extra_surf.get_width() - 6,
+                 mid_y - extra_surf.get_height() // 2)
+            )
+
+    def render_mini_card(self, surf, rect, p, state):
+        score, alive, timer = state
+        mid_y = rect.y + rect.h // 2
+        radius = max(3, min(6, rect.h // 2 - 2))
+        pygame.draw.rect(surf, (30, 30, 30), rect, border_radius=4)
+        pygame.draw.circle(surf, p.color if alive else (90, 90, 90),
+                           (rect.x + radius + 3, mid_y), radius, 0 if alive else 1)
+        color = (255, 215, 0) if timer and timer[0] == "power" else (255, 255, 255)
+        score_surf = render_text(self.font_small, str(score), color)
+        surf.blit(score_surf, (rect.x + 2 * radius + 6, mid_y - score_surf.get_height() // 2),
+                  pygame.Rect(0, 0, rect.right - rect.x - 2 * radius - 7, rect.h))
+
+
+def make_circle_surf(color, radius=8):
+    surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+    pygame.draw.circle(surf, color, (radius, radius), radius)
+    return surf
+
+
+def make_arrow_surf(width=20, height=16, color=(255, 255, 255), thickness=6):
+    surf = pygame.Surface((width, height), pygame.SRCALPHA)
+    pygame.draw.rect(
+        surf,
+        color,
+        (0, (height-thickness)//2, width-height//2, thickness)
+    )
+    pygame.draw.polygon(
+        surf,
+        color,
+        [(width-height//2, 0), (width, height//2), (width-height//2, height)]
+    )
+    return surf
@@ -0,0 +1,133 @@
+# snapshot.py — Compact match snapshots for rollback, restart and lookahead
+
+import struct
+
+import numpy as np
+
+from player import Player
+
+EMPTY, DOT, PELLET = 0, 1, 2  # one byte per cell in DotBitmap / Snapshot.dots
+FIELDS = len(Player.STATE_FIELDS)
+BOOL_FIELDS = tuple(i for i, f in enumerate(Player.STATE_FIELDS) if f in ("alive", "power_mode"))
+
+# Serialized Snapshot (replay keyframes): ticks, dot_timer, game_over, the
+# RNG's 625 Mersenne Twister words, whether gauss_next is set and its value,
+# then the counts of player ints (i64 each) and dot bytes that follow
+RECORD = struct.Struct("<IIB625IBdII")
+
+
+class DotBitmap:
+    """One byte per maze cell telling whether it holds a dot or a pellet.
+
+    Follows a dot backend through its ``watchers``, so it is always current
+    without scanning the dots. Cells hold at most one dot, as the game
+    places them.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.cells = bytearray(width * height)
+
+    def attach(self, dots):
+        """Follow ``dots`` from now on, starting from its current contents."""
+        self.cells[:] = bytes(len(self.cells))
+        for d in dots:
+            self.dot_added(*dots.cell_of(d.x, d.y), d.is_power_pellet)
+        dots.watchers.append(self)
+
+    def dot_added(self, gx, gy, power=False):
+        self.cells[gy * self.width + gx] = PELLET if power else DOT
+
+    def dot_removed(self, gx, gy):
+        self.cells[gy * self.width + gx] = EMPTY
+
+
+class Snapshot:
+    """Everything that changes during a match, in fixed-size buffers.
+
+    * ``players`` — a flat record, ``Player.STATE_FIELDS`` of player i
+      starting at ``i * FIELDS``
+    * ``dots`` — a copy of the game's DotBitmap
+    * ``maze`` — shared by reference, never copied (and not serialized; a
+      replay rebuilds it from the seed)
+
+    ``Game.snapshot(into=snap)`` refills an existing snapshot's buffers in
+    place (only the RNG state tuple is new each time), and
+    ``Game.restore`` only touches the dots that differ, so a search can
+    branch and rewind thousands of times per frame.
+    """
+
+    __slots__ = ("ticks", "dot_timer", "game_over", "rng", "players", "dots", "maze")
+
+    def __init__(self, game):
+        self.players = [0] * (len(game.players) * FIELDS)
+        self.dots = bytearray(len(game.dot_bitmap.cells))
+        self.capture(game)
+
+    def fits(self, game):
+        return (len(self.players) == len(game.players) * FIELDS
+                and len(self.dots) == len(game.dot_bitmap.cells))
+
+    def capture(self, game):
+        self.ticks, self.dot_timer, self.game_over = game.ticks, game.dot_timer, game.game_over
+        self.rng = game.rng.getstate()
+        rec, i = self.players, 0
+        for p in game.players:
+            rec[i:i + FIELDS] = p.get_state()
+            i += FIELDS
+        self.dots[:] = game.dot_bitmap.cells
+        self.maze = game.maze
+
+    def apply(self, game):
+        game.ticks, game.dot_timer, game.game_over = self.ticks, self.dot_timer, self.game_over
+        game.rng.setstate(self.rng)
+        rec, i = self.players, 0
+        for p in game.players:
+            p.set_state(rec[i:i + FIELDS])
+            i += FIELDS
+
+        # Respawn or remove only the dots that differ from the saved bitmap
+        now, saved = game.dot_bitmap.cells, self.dots
+        if now != saved:
+            cell, top, w = game.cell, game.TOP_MARGIN, game.dot_bitmap.width
+            changed = np.flatnonzero(np.frombuffer(now, np.uint8) != np.frombuffer(saved, np.uint8))
+            for i in changed.tolist():
+                gy, gx = divmod(i, w)
+                if now[i]:
+                    game.dots.remove_at(gx, gy)
+                if saved[i]:
+                    game.dots.spawn(gx * cell, gy * cell + top, saved[i] == PELLET)
+
+    # --------------------------------------------------
+    # Fixed binary layout for replay keyframes (see RECORD); no pickle, so
+    # loading a shared replay cannot run code
+    # --------------------------------------------------
+    def to_bytes(self):
+        version, words, gauss = self.rng
+        return b"".join([
+            RECORD.pack(self.ticks, self.dot_timer, self.game_over, *words,
+                        gauss is not None, gauss or 0.0, len(self.players), len(self.dots)),
+            struct.pack(f"<{len(self.players)}q", *self.players),
+            bytes(self.dots),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data, pos=0):
+        """A Snapshot (with no maze) read at ``pos``; returns it and the end."""
+        fields = RECORD.unpack_from(data, pos)
+        pos += RECORD.size
+        n_players, n_dots = fields[-2:]
+        if n_players % FIELDS or pos + 8 * n_players + n_dots > len(data):
+            raise ValueError("corrupt snapshot record")
+        snap = cls.__new__(cls)
+        snap.ticks, snap.dot_timer, game_over = fields[:3]
+        snap.game_over = bool(game_over)
+        snap.rng = (3, fields[3:628], fields[629] if fields[628] else None)
+        snap.players = list(struct.unpack_from(f"<{n_players}q", data, pos))
+        pos += 8 * n_players
+        for i in range(0, n_players, FIELDS):
+            for f in BOOL_FIELDS:
+                snap.players[i + f] = bool(snap.players[i + f])
+        snap.dots = bytearray(data[pos:pos + n_dots])
+        snap.maze = None
+        return snap, pos + n_dots
@@ -0,0 +1,71 @@
+# sprites.py — Pre-rendered Pac-Man frames for Player.draw
+
+import math
+
+import pygame
+
+from fonts import get_font, render_text
+
+# Mouth opening per direction (degrees), as (start, end) of the body arc
+MOUTHS = {
+    (1, 0): (30, 330),    # Right
+    (-1, 0): (210, 150),  # Left
+    (0, -1): (120, 60),   # Up
+    (0, 1): (300, 240),   # Down
+}
+DIRECTIONS = list(MOUTHS)
+MOUTH_PHASES, MOUTH_VAR = 3, 20
+FLASH_COLOR = (255, 255, 255)
+
+
+def facing(dx, dy):
+    """Map a (dx, dy) heading to one of DIRECTIONS, defaulting to right."""
+    if dx:
+        return (dx, 0)
+    if dy:
+        return (0, dy)
+    return (1, 0)
+
+
+class PlayerSprites:
+    """Every frame a player can show, baked into one atlas surface.
+
+    Columns are direction x mouth phase, rows are normal colour and the
+    power-mode white flash. Built once per (cell, colour, id).
+    """
+
+    def __init__(self, player_id, color, cell):
+        self.player_id, self.color, self.cell = player_id, color, cell
+        cols = len(DIRECTIONS) * MOUTH_PHASES
+        self.atlas = pygame.Surface((cols * cell, 2 * cell), pygame.SRCALPHA)
+        self.frames = {}
+        label = render_text(get_font('Arial', 12), player_id, (255, 255, 255))
+
+        for row, body in enumerate((color, FLASH_COLOR)):
+            for d, direction in enumerate(DIRECTIONS):
+                for phase in range(MOUTH_PHASES):
+                    rect = pygame.Rect((d * MOUTH_PHASES + phase) * cell, row * cell, cell, cell)
+                    self._draw_frame(rect, body, direction, phase, label)
+                    self.frames[(direction, phase, row == 1)] = rect
+
+    def _draw_frame(self, rect, body, direction, phase, label):
+        radius = self.cell // 2
+        start_angle, end_angle = MOUTHS[direction]
+        off = MOUTH_VAR * phase / MOUTH_PHASES
+        start_angle += off
+        end_angle -= off
+
+        surf = self.atlas.subsurface(rect)
+        # Pac-Man body with arc mouth
+        pygame.draw.arc(surf, body, (0, 0, self.cell, self.cell),
+                        math.radians(start_angle), math.radians(end_angle), radius)
+        # Inner circle for eye / ID background
+        pygame.draw.circle(surf, (50, 50, 50), (radius, radius), radius // 3)
+        # Player ID at center
+        surf.blit(label, label.get_rect(center=(radius, radius)))
+
+    def matches(self, player_id, color, cell):
+        return (self.player_id, self.color, self.cell) == (player_id, color, cell)
+
+    def blit(self, screen, pos, direction, phase, flash):
+        screen.blit(self.atlas, pos, self.frames[(direction, phase, flash)])
@@ -0,0 +1,308 @@
+# telemetry.py — Match event stream, batched to JSONL or SQLite off the game thread
+
+import argparse
+import json
+import os
+import queue
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from array import array
+
+# Event kinds
+DOT, PELLET, KILL, RESPAWN, WAVE = range(5)
+EVENT_NAMES = ("dot", "pellet", "kill", "respawn", "wave")
+FIELDS = 6  # kind, tick, player, target, x, y
+
+
+class Telemetry:
+    """Records what happens in a match: dots and pellets eaten, kills,
+    respawns and dot waves, each with its tick, player and cell.
+
+    Attach to a Game (``Telemetry(game, "events.jsonl")``); ``Game.update``
+    calls ``emit`` as things happen and ``match_over`` at game over, which
+    also writes a per-match summary. Events go into a preallocated ring of
+    integers; every ``batch`` events the filled stretch is copied out in one
+    piece and handed to a background thread that writes it to the sink, so
+    a tick pays only for a few array stores. If the writer falls behind by
+    ``max_pending`` batches, further batches are counted in ``dropped``
+    instead of stalling the game.
+
+    Paths ending in .db, .sqlite or .sqlite3 get a SQLite database, anything
+    else JSON lines. Call ``close()`` when done to flush and stop the writer.
+    """
+
+    def __init__(self, game, path, capacity=4096, batch=512, max_pending=64):
+        self.path = path
+        self.batch = batch
+        self.capacity = capacity
+        self._buf = array("q", bytes(8 * FIELDS * self.capacity))
+        self._pos = self._flushed = 0
+        self.count = self.dropped = 0
+        self.match = None
+        self._summarised = True
+        self.error = None  # first exception raised by the writer thread
+        sink = open_sink(path)
+        sink.open()  # here, so a bad path fails now rather than on the writer
+        self._queue = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._write, args=(sink,),
+                                        name="telemetry", daemon=True)
+        self._thread.start()
+        self.start(game)
+
+    # --------------------------------------------------
+    # Match boundaries
+    # --------------------------------------------------
+    def start(self, game):
+        """Begin a new match (on attach and from ``Game.reset``)."""
+        if not self._summarised:
+            self.match_over(game, finished=False)
+        game.telemetry = self
+        self.seed = game.seed
+        self.match = f"{time.strftime('%Y%m%dT%H%M%S')}-{game.seed}"
+        self._summarised = False
+        self._send(("match", self.match, [p.id for p in game.players]))
+
+    def match_over(self, game, finished=True):
+        self.flush()
+        self._summarised = True
+        self._send(("summary", self.match, {
+            "match": self.match,
+            "seed": self.seed,
+            "ticks": game.ticks,
+            "finished": finished,
+            "players": [{"id": p.id, "score": p.score, "kills": p.kills,
+                         "deaths": p.deaths, "dots": p.dots_eaten} for p in game.players],
+        }))
+
+    def close(self, game=None):
+        """Summarise an unfinished match, flush, and wait for the writer.
+
+        Re-raises the error that stopped the writer, if any.
+        """
+        if game is not None and not self._summarised:
+            self.match_over(game, finished=game.game_over)
+        self.flush()
+        self._queue.put(None)  # never dropped: the writer must see it
+        self._thread.join()
+        self._check()
+
+    # --------------------------------------------------
+    # Hot path
+    # --------------------------------------------------
+    def emit(self, kind, tick, player=-1, target=-1, x=-1, y=-1):
+        buf, o = self._buf, self._pos * FIELDS
+        buf[o] = kind
+        buf[o + 1] = tick
+        buf[o + 2] = player
+        buf[o + 3] = target
+        buf[o + 4] = x
+        buf[o + 5] = y
+        self._pos += 1
+        self.count += 1
+        # Match boundaries flush part batches, so the end of the ring need
+        # not fall on a batch boundary; wrap there whatever the alignment
+        if self._pos == self.capacity or self._pos - self._flushed >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if self._pos > self._flushed:
+            chunk = self._buf[self._flushed * FIELDS:self._pos * FIELDS]
+            self._send(("events", self.match, chunk))
+            self._flushed = self._pos
+        if self._pos == self.capacity:
+            self._pos = self._flushed = 0
+
+    def sync(self):
+        """Flush and wait until the writer has stored everything so far.
+
+        Re-raises the error that stopped the writer, if any.
+        """
+        self.flush()
+        self._queue.join()
+        self._check()
+
+    def _check(self):
+        if self.error is not None:
+            raise self.error
+
+    def _send(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if item[0] == "events":
+                self.dropped += len(item[2]) // FIELDS
+            else:
+                self._queue.put(item)  # match bookkeeping is small; wait for room
+
+    # --------------------------------------------------
+    # Writer thread
+    # --------------------------------------------------
+    def _write(self, sink):
+        # After an error keep taking items (and marking them done) without
+        # writing them, so sync() and a full queue never wait forever; the
+        # error surfaces from sync() and close()
+        names = {}
+        try:
+            while True:
+                item = self._queue.get()
+                try:
+                    if item is None:
+                        return
+                    if self.error is None:
+                        what, match, data = item
+                        if what == "match":
+                            names[match] = data
+                        elif what == "events":
+                            sink.events(match, decode(data, names[match]))
+                        else:
+                            sink.summary(match, data)
+                except Exception as e:
+                    self.error = e
+                finally:
+                    self._queue.task_done()
+        finally:
+            sink.close()
+
+
+def decode(data, ids):
+    """Rows of (event, tick, player, target, x, y) from a flat batch.
+
+    ``target`` is the victim's id for kills and the dot count for waves;
+    -1 placeholders become None.
+    """
+    rows = []
+    for i in range(0, len(data), FIELDS):
+        kind, tick, player, target, x, y = data[i:i + FIELDS]
+        rows.append((EVENT_NAMES[kind], tick,
+                     ids[player] if player >= 0 else None,
+                     ids[target] if kind == KILL else (target if target >= 0 else None),
+                     x if x >= 0 else None, y if y >= 0 else None))
+    return rows
+
+
+# --------------------------------------------------
+# Sinks; opened by Telemetry, then written only on the writer thread
+# --------------------------------------------------
+class JsonlSink:
+    """One JSON object per line: events, then a summary line per match."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def open(self):
+        self.file = open(self.path, "a")
+
+    def events(self, match, rows):
+        self.file.writelines(
+            json.dumps({"match": match, "tick": tick, "event": name, "player": player,
+                        "target": target, "x": x, "y": y}) + "\n"
+            for name, tick, player, target, x, y in rows)
+
+    def summary(self, match, data):
+        self.file.write(json.dumps(dict(data, event="summary")) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class SqliteSink:
+    """Tables ``events`` (one row per event) and ``matches`` (one summary each)."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def open(self):
+        self.db = sqlite3.connect(self.path, check_same_thread=False)  # handed to the writer
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS events (
+                match TEXT, tick INTEGER, event TEXT, player TEXT, target TEXT,
+                x INTEGER, y INTEGER);
+            CREATE TABLE IF NOT EXISTS matches (
+                match TEXT PRIMARY KEY, seed INTEGER, ticks INTEGER, finished INTEGER,
+                players TEXT);
+        """)
+
+    def events(self, match, rows):
+        self.db.executemany("INSERT INTO events (match, event, tick, player, target, x, y)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            [(match, *row) for row in rows])
+        self.db.commit()
+
+    def summary(self, match, data):
+        self.db.execute("INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?)",
+                        (match, data["seed"], data["ticks"], int(data["finished"]),
+                         json.dumps(data["players"])))
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+def open_sink(path):
+    if os.path.splitext(path)[1].lower() in (".db", ".sqlite", ".sqlite3"):
+        return SqliteSink(path)
+    return JsonlSink(path)
+
+
+# --------------------------------------------------
+# Self-check: one Telemetry reused across Game.reset
+# --------------------------------------------------
+def check(matches=6, ticks=3600, capacity=100, batch=16):
+    """Play ``matches`` seeded matches through one ``Telemetry`` whose ring
+    is small and not a multiple of ``batch``, so it wraps at every
+    alignment, then compare the written log against the game counters.
+
+    Returns the number of events checked; raises AssertionError on a
+    mismatch.
+    """
+    from game import Game
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.jsonl")
+        game = Game(None, max_ticks=ticks, seed=0)
+        tel = Telemetry(game, path, capacity=capacity, batch=batch, max_pending=1 << 20)
+        rng, expected = random.Random(0), {}
+        for seed in range(matches):
+            if seed:
+                game.reset(seed)
+            while not game.game_over:
+                game.step([rng.randrange(5) for _ in game.players])
+            expected[tel.match] = sum(p.dots_eaten for p in game.players)
+        tel.close(game)
+
+        eaten, summaries = dict.fromkeys(expected, 0), 0
+        with open(path) as f:
+            rows = [json.loads(line) for line in f]
+    for row in rows:
+        if row["event"] == "summary":
+            summaries += 1
+        elif row["event"] in ("dot", "pellet"):
+            eaten[row["match"]] += 1
+    assert tel.dropped == 0, f"{tel.dropped} events dropped"
+    assert len(rows) - summaries == tel.count, (len(rows) - summaries, tel.count)
+    assert summaries == matches and eaten == expected, (eaten, expected)
+    return tel.count
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Match telemetry; --check runs the self-check.")
+    ap.add_argument("--check", action="store_true",
+                    help="reuse one Telemetry over several matches and verify the log")
+    ap.add_argument("--matches", type=int, default=6)
+    ap.add_argument("--ticks", type=int, default=3600)
+    args = ap.parse_args(argv)
+    if not args.check:
+        ap.print_help()
+        return 0
+    n = check(args.matches, args.ticks)
+    print(f"{args.matches} matches, {n} events: log matches the games")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# timestep.py — Fixed-rate simulation ticks decoupled from the render rate
+
+import time
+
+
+class FixedTimestep:
+    """Accumulator that turns wall-clock time into whole simulation ticks.
+
+    Call ``steps()`` once per rendered frame and run ``Game.update`` that many
+    times: none when rendering outpaces the tick rate, several when a slow
+    frame left the game behind. Rule timings (cooldowns, power and respawn
+    timers) are counted in ticks, so they stay in real time however fast the
+    screen refreshes.
+
+    At most ``max_steps`` ticks run per frame. Anything beyond that is
+    dropped rather than caught up later, so a machine that cannot keep up
+    plays in slow motion instead of spiralling into ever longer catch-ups.
+    """
+
+    def __init__(self, tick_rate=60, max_steps=5, clock=time.perf_counter):
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.clock = clock
+        self.accumulator = 0.0
+        self.last = None
+        self.frames = 0    # steps() calls, i.e. rendered frames
+        self.ticks = 0     # simulation ticks handed out
+        self.skipped = 0   # ticks run without a render of their own (frame skipping)
+        self.dropped = 0   # ticks thrown away by the max_steps cap
+        self.started = None
+
+    def steps(self):
+        now = self.clock()
+        if self.last is None:
+            self.last = self.started = now
+            self.accumulator = self.dt  # the first frame runs one tick
+        self.accumulator += now - self.last
+        self.last = now
+
+        n = int(self.accumulator / self.dt + 1e-6)  # absorb float drift at whole ticks
+        self.accumulator -= n * self.dt
+        if n > self.max_steps:
+            self.dropped += n - self.max_steps
+            n = self.max_steps
+        self.frames += 1
+        self.ticks += n
+        self.skipped += max(0, n - 1)
+        return n
+
+    # --------------------------------------------------
+    def stats(self):
+        elapsed = (self.last - self.started) if self.started is not None else 0.0
+        return {
+            "frames": self.frames,
+            "ticks": self.ticks,
+            "skipped": self.skipped,
+            "dropped": self.dropped,
+            "fps": round(self.frames / elapsed, 1) if elapsed else 0.0,
+            "tps": round(self.ticks / elapsed, 1) if elapsed else 0.0,
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"{s['frames']} frames ({s['fps']} fps), {s['ticks']} ticks ({s['tps']}/s); "
+                f"{s['skipped']} ticks ran without their own frame, "
+                f"{s['dropped']} dropped to keep up")
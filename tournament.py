@@ -0,0 +1,222 @@
+# tournament.py — Run many seeded headless matches across every core
+
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keep stdout clean JSON
+
+import maze
+from game import Game
+from telemetry import Telemetry
+from player import ACTION_DIRECTIONS
+
+# Rule knobs a tournament can sweep; passed straight to Game(...)
+TUNABLES = ("respawn_delay", "dot_intv", "dot_amt", "move_cooldown", "players")
+
+
+class RandomWalker:
+    """Keeps its heading and turns at random, like a player mashing keys."""
+
+    def __init__(self, rng, turn_chance=0.1):
+        self.rng = rng
+        self.turn_chance = turn_chance
+        self.action = rng.randrange(1, len(ACTION_DIRECTIONS))
+
+    def act(self):
+        if self.rng.random() < self.turn_chance:
+            self.action = self.rng.randrange(1, len(ACTION_DIRECTIONS))
+        return self.action
+
+
+# --------------------------------------------------
+# One match; runs inside a worker process
+# --------------------------------------------------
+_telemetry = None  # this worker's Telemetry, shared by all its matches
+
+
+def worker_telemetry(game, path):
+    """Attach ``game`` to the worker's event log, opening it on first use.
+
+    Each worker process writes its own file (``path`` with the pid added).
+    """
+    global _telemetry
+    if _telemetry is None:
+        stem, ext = os.path.splitext(path)
+        _telemetry = Telemetry(game, f"{stem}-{os.getpid()}{ext}")
+    else:
+        _telemetry.start(game)
+    return _telemetry
+
+
+def play_match(seed, ticks=3600, policy="random", telemetry=None, **rules):
+    # "bot" seats every player with a nav.BotController; their step() actions are ignored
+    game = Game(None, max_ticks=ticks, seed=seed, bots="all" if policy == "bot" else None, **rules)
+    walkers = [RandomWalker(random.Random(seed * 1000 + i)) for i in range(len(game.players))]
+    if telemetry:
+        telemetry = worker_telemetry(game, telemetry)
+
+    while not game.game_over:
+        game.step([w.act() for w in walkers])
+    if telemetry:
+        # The writer is a daemon thread; make sure the match is on disk
+        # before the pool may shut this process down
+        telemetry.sync()
+
+    return {
+        "seed": seed,
+        "ticks": game.ticks,
+        "players": [
+            {"id": p.id, "score": p.score, "kills": p.kills,
+             "deaths": p.deaths, "dots": p.dots_eaten}
+            for p in game.players
+        ],
+    }
+
+
+def play_chunk(seeds, ticks, rules):
+    return [play_match(seed, ticks, **rules) for seed in seeds]
+
+
+# --------------------------------------------------
+# Stream results back in seed order while at most 2 * workers chunks are
+# in flight, so memory stays bounded however many matches are requested
+# --------------------------------------------------
+def run_tournament(seeds, ticks=3600, rules=None, workers=None, chunk_size=8):
+    rules = rules or {}
+    workers = workers or os.cpu_count() or 1
+    seeds = iter(seeds)
+    chunks = iter(lambda: list(islice(seeds, chunk_size)), [])
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(play_chunk, chunk, ticks, rules))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class PlayerStats:
+    """Running score distribution (Welford) plus kill and dot totals."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = self._m2 = 0.0
+        self.min = self.max = None
+        self.scores = Counter()
+        self.kills = self.deaths = self.dots = 0
+
+    def add(self, result):
+        score = result["score"]
+        self.n += 1
+        delta = score - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (score - self.mean)
+        self.min = score if self.min is None else min(self.min, score)
+        self.max = score if self.max is None else max(self.max, score)
+        self.scores[score] += 1
+        self.kills += result["kills"]
+        self.deaths += result["deaths"]
+        self.dots += result["dots"]
+
+    def percentile(self, q):
+        target, seen = q * self.n, 0
+        for score in sorted(self.scores):
+            seen += self.scores[score]
+            if seen >= target:
+                return score
+        return self.max
+
+    def summary(self):
+        return {
+            "matches": self.n,
+            "score_mean": round(self.mean, 3),
+            "score_std": round(math.sqrt(self._m2 / self.n), 3) if self.n else 0.0,
+            "score_min": self.min,
+            "score_p50": self.percentile(0.5),
+            "score_p90": self.percentile(0.9),
+            "score_max": self.max,
+            "kills": self.kills,
+            "deaths": self.deaths,
+            "dots": self.dots,
+        }
+
+
+# --------------------------------------------------
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run seeded headless matches in parallel.")
+    ap.add_argument("--matches", type=int, default=1000)
+    ap.add_argument("--seed-start", type=int, default=0)
+    ap.add_argument("--ticks", type=int, default=3600, help="ticks per match (60 = 1s)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--chunk", type=int, default=8, help="matches per work unit")
+    ap.add_argument("--policy", choices=["random", "bot"], default="random",
+                    help="random walkers or the built-in distance-field bots")
+    ap.add_argument("--csv", help="write one row per player per match")
+    ap.add_argument("--jsonl", help="write one JSON object per match")
+    ap.add_argument("--summary", help="write aggregated stats as JSON")
+    ap.add_argument("--maze-cache", metavar="DIR", help="share generated large mazes between workers")
+    ap.add_argument("--telemetry", metavar="PATH",
+                    help="log match events; each worker writes PATH with its pid added")
+    for name in TUNABLES:
+        ap.add_argument("--" + name.replace("_", "-"), type=int, dest=name)
+    args = ap.parse_args(argv)
+    if args.maze_cache:
+        maze.set_cache_dir(args.maze_cache)
+
+    rules = {k: getattr(args, k) for k in TUNABLES if getattr(args, k) is not None}
+    if args.policy != "random":
+        rules["policy"] = args.policy
+    if args.telemetry:
+        rules["telemetry"] = args.telemetry
+    seeds = range(args.seed_start, args.seed_start + args.matches)
+    stats = {}
+
+    csv_file = open(args.csv, "w", newline="") if args.csv else None
+    jsonl_file = open(args.jsonl, "w") if args.jsonl else None
+    writer = csv.writer(csv_file) if csv_file else None
+    if writer:
+        writer.writerow(["seed", "player", "score", "kills", "deaths", "dots"])
+
+    start = time.perf_counter()
+    try:
+        for result in run_tournament(seeds, args.ticks, rules, args.workers, args.chunk):
+            for p in result["players"]:
+                stats.setdefault(p["id"], PlayerStats()).add(p)
+                if writer:
+                    writer.writerow([result["seed"], p["id"], p["score"],
+                                     p["kills"], p["deaths"], p["dots"]])
+            if jsonl_file:
+                jsonl_file.write(json.dumps(result) + "\n")
+    finally:
+        for f in (csv_file, jsonl_file):
+            if f:
+                f.close()
+    elapsed = time.perf_counter() - start
+
+    summary = {
+        "matches": args.matches,
+        "ticks": args.ticks,
+        "rules": rules,
+        "seconds": round(elapsed, 3),
+        "players": {pid: s.summary() for pid, s in sorted(stats.items())},
+    }
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(summary, f, indent=2)
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()